@@ -0,0 +1,36 @@
+import io
+import math
+import contextlib
+
+from generators import generate
+
+
+# admissão dos jobs: mede o método em vetores pequenos do mesmo tipo e extrapola para o tamanho pedido, para não
+# gastar o timeout inteiro (2h por padrão) num Insert de 1000000 que nunca terminaria
+
+CALIBRATION_SIZES = (512, 1024, 2048)
+
+
+def calibrate(sort, typeArray, sizes=CALIBRATION_SIZES, repeats=3): # (n, segundos) do melhor de `repeats` em cada tamanho
+    points = []
+    for n in sizes:
+        data = generate(typeArray, n, 0).tolist()
+        with contextlib.redirect_stdout(io.StringIO()): # sem o relatório de cada ordenação
+            best = min(sort(list(data)).sort_ns for _ in range(repeats))
+        points.append((n, max(best, 1) / 1e9))
+    return points
+
+
+def extrapolate(points, cost, n): # segundos estimados para n a partir da calibração e do modelo de custo do método
+    n1, t1 = points[0]
+    n0, t0 = points[-1]
+    if n <= n0:
+        return t0
+    # pelo modelo: tempo por operação (comparações + movimentos esperados) medido no maior tamanho calibrado
+    ops0 = sum(cost(n0))
+    byModel = t0 * sum(cost(n)) / ops0 if ops0 else math.inf
+    # pela curva medida: o modelo é de caso médio e superestima entradas fáceis (Insert em OrdC é linear),
+    # então o crescimento observado entre os tamanhos calibrados também limita a estimativa
+    growth = max(math.log(t0 / t1) / math.log(n0 / n1), 1)
+    byCurve = t0 * (n / n0) ** growth
+    return min(byModel, byCurve) # fica com a menor: na dúvida o job roda e o timeout real decide
@@ -0,0 +1,220 @@
+import io
+import sys
+import json
+import math
+import time
+import argparse
+import statistics
+import contextlib
+
+from registry import algorithm
+from generators import generate
+
+
+# complexidade empírica: mede (ou lê do diário de uma execução) comparações, movimentos e tempo em vários tamanhos,
+# ajusta cada série a modelos candidatos c * g(n) por mínimos quadrados e confere o modelo de custo de cada método
+# (os Cálculos esperados dos relatórios) contra o medido. Com o tempo ajustado, acha o n em que um método passa o outro.
+#
+# o ajuste é no erro relativo, sum(((y - c*g(n)) / y)^2): no absoluto o maior tamanho decidiria tudo sozinho.
+# com erro relativo o c ótimo tem forma fechada, c = sum(g/y) / sum((g/y)^2)
+
+MODELS = {
+    'n': lambda n: n,
+    'n log n': lambda n: n * math.log2(n),
+    'n log^2 n': lambda n: n * math.log2(n) ** 2,
+    'n^1.25': lambda n: n ** 1.25,
+    'n^1.5': lambda n: n ** 1.5,
+    'n^2': lambda n: n * n,
+}
+METRICS = ('comparisons', 'movements', 'time')
+DEFAULT_SIZES = (500, 1000, 2000, 4000, 8000, 16000, 32000, 64000)
+CROSSOVER_LIMIT = 10 ** 9 # até onde os modelos ajustados são extrapolados
+
+
+def fitModel(points, g): # (constante, resíduos relativos) de y = c * g(n) nos pontos (n, y)
+    ratios = [g(n) / y for n, y in points]
+    c = sum(ratios) / sum(r * r for r in ratios)
+    return c, [c * g(n) / y - 1 for n, y in points]
+
+
+def fitAll(points): # todos os modelos, do melhor (menor resíduo RMS) para o pior
+    points = [(n, y) for n, y in points if y and n > 1]
+    if len(points) < 2:
+        return []
+    fits = []
+    for name, g in MODELS.items():
+        c, residuals = fitModel(points, g)
+        fits.append({'model': name, 'constant': c, 'rms': math.sqrt(statistics.fmean(r * r for r in residuals)),
+                     'max': max(abs(r) for r in residuals), 'residuals': residuals})
+    return sorted(fits, key=lambda fit: fit['rms'])
+
+
+def measure(method, typeArray, sizes, seed=0, maxSeconds=2.0): # {n: {métrica: valor}} medindo no próprio processo
+    entry = algorithm(method)
+    rows = {}
+    for n in sizes:
+        data = generate(typeArray, n, seed)
+        if entry.kind == 'numpy':
+            import numpy as np
+            load = lambda: np.array(data, dtype=np.int64)
+        else:
+            load = data.tolist
+        with contextlib.redirect_stdout(io.StringIO()): # sem os relatórios de cada ordenação
+            counted = entry.function()(load())
+            timed = min(entry.function(lean=True)(load()).sort_ns for _ in range(3))
+        rows[n] = {'comparisons': counted.comparisons, 'movements': counted.movements, 'time': timed / 1e9}
+        if timed / 1e9 > maxSeconds: # o próximo tamanho (o dobro) passaria bem do orçamento
+            break
+    return rows
+
+
+def journalSeries(filename): # {(método, tipo): {n: {métrica: mediana}}} das repetições 'ok' de um diário do sortMethods
+    grouped = {}
+    with open(filename) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get('status') != 'ok':
+                continue
+            sample = grouped.setdefault((record['method'], record['vector_type']), {}).setdefault(record['size'], [])
+            sample.append(record)
+    return {key: {n: {'comparisons': medianOf(records, 'comparisons'), 'movements': medianOf(records, 'movements'),
+                      'time': medianOf(records, 'sort_ns') / 1e9}
+                  for n, records in sorted(sizes.items())}
+            for key, sizes in grouped.items()}
+
+
+def medianOf(records, key):
+    values = [record[key] for record in records if record[key] is not None]
+    return statistics.median_low(values) if values else None
+
+
+def costRatio(method, rows, metric): # medido / esperado pelo modelo de custo do método, no maior n
+    entry = algorithm(method)
+    n = max(rows)
+    if metric == 'time' or entry.costs is None or rows[n][metric] is None:
+        return None
+    expected = entry.costs(n)[METRICS.index(metric)]
+    return rows[n][metric] / expected if expected else None
+
+
+def measuredCrossover(rowsA, rowsB): # (n, A mais rápido abaixo dele?) na última inversão da ordem dos tempos medidos
+    # a última e não a primeira: em n pequeno o ruído inverte a ordem à toa, e o que interessa é quem fica na frente daí
+    # para cima; o n é interpolado em log-log entre os dois tamanhos medidos
+    common = [n for n in sorted(set(rowsA) & set(rowsB)) if rowsA[n]['time'] and rowsB[n]['time']]
+    gaps = [math.log(rowsA[n]['time'] / rowsB[n]['time']) for n in common] # < 0: A mais rápido
+    for (n0, d0), (n1, d1) in reversed(list(zip(zip(common, gaps), zip(common[1:], gaps[1:])))):
+        if (d0 < 0) != (d1 < 0):
+            return round(math.exp(math.log(n0) + (math.log(n1) - math.log(n0)) * d0 / (d0 - d1))), d0 < 0
+    return None, (gaps[-1] < 0 if gaps else None)
+
+
+def modelCrossover(fitA, fitB, low, high=CROSSOVER_LIMIT): # n > low onde os tempos ajustados se cruzam (extrapolado)
+    diff = lambda n: fitA['constant'] * MODELS[fitA['model']](n) - fitB['constant'] * MODELS[fitB['model']](n)
+    if (diff(low) < 0) == (diff(high) < 0):
+        return None
+    while high - low > 1: # bissecção em escala logarítmica
+        mid = math.sqrt(low * high)
+        if (diff(mid) < 0) == (diff(low) < 0):
+            low = mid
+        else:
+            high = mid
+    return round(high)
+
+
+def analyze(series): # series: {(método, tipo): {n: {métrica: valor}}} -> (linhas dos ajustes, linhas dos cruzamentos)
+    fits = []
+    timeFits = {}
+    for (method, typeArray), rows in series.items():
+        for metric in METRICS:
+            ranked = fitAll([(n, values[metric]) for n, values in rows.items()])
+            if not ranked:
+                continue
+            fits.append({'method': method, 'vector_type': typeArray, 'metric': metric, 'best': ranked[0],
+                         'runner_up': ranked[1] if len(ranked) > 1 else None, 'sizes': (min(rows), max(rows)),
+                         'cost_ratio': costRatio(method, rows, metric)})
+            if metric == 'time':
+                timeFits[(method, typeArray)] = ranked[0]
+
+    crossings = []
+    keys = list(timeFits)
+    for i, (methodA, typeA) in enumerate(keys):
+        for methodB, typeB in keys[i + 1:]:
+            if typeA != typeB:
+                continue
+            # primeiro nos tamanhos medidos; sem inversão ali, os modelos ajustados são extrapolados para cima (para baixo
+            # do menor tamanho medido os custos fixos dominam e os modelos c * g(n) não valem)
+            rowsA, rowsB = series[(methodA, typeA)], series[(methodB, typeB)]
+            n, aFirst = measuredCrossover(rowsA, rowsB)
+            measured = n is not None
+            if n is None and aFirst is not None:
+                n = modelCrossover(timeFits[(methodA, typeA)], timeFits[(methodB, typeB)], max(set(rowsA) & set(rowsB)))
+            if aFirst is None: # nenhum tamanho em comum
+                continue
+            crossings.append({'a': methodA, 'b': methodB, 'vector_type': typeA, 'n': n, 'measured': measured,
+                              'below': methodA if aFirst else methodB,
+                              'above': (methodB if aFirst else methodA) if n is not None else (methodA if aFirst else methodB)})
+    return fits, crossings
+
+
+def writeReport(fits, crossings, f=sys.stdout):
+    from sortMethods import writeTable
+
+    writeTable(f, ["Method", "Vector Type", "Metric", "Sizes", "Best fit", "Constant", "RMS resid", "Max resid", "Runner-up",
+                   "Measured/model"], [[
+        fit['method'],
+        fit['vector_type'],
+        fit['metric'],
+        f"{fit['sizes'][0]}-{fit['sizes'][1]}",
+        fit['best']['model'],
+        f"{fit['best']['constant']:.4g}",
+        f"{fit['best']['rms']:.1%}",
+        f"{fit['best']['max']:.1%}",
+        f"{fit['runner_up']['model']} ({fit['runner_up']['rms']:.1%})" if fit['runner_up'] else "-",
+        f"{fit['cost_ratio']:.3f}" if fit['cost_ratio'] is not None else "N/A",
+    ] for fit in fits], left=(0, 1, 2, 4, 8))
+
+    if crossings:
+        f.write("\n")
+        writeTable(f, ["Method A", "Method B", "Vector Type", "Crossover n", "Within measured", "Faster below", "Faster above"], [[
+            crossing['a'],
+            crossing['b'],
+            crossing['vector_type'],
+            str(crossing['n']) if crossing['n'] is not None else "-",
+            ("yes" if crossing['measured'] else "no") if crossing['n'] is not None else "-",
+            crossing['below'],
+            crossing['above'],
+        ] for crossing in crossings], left=(0, 1, 2, 5, 6))
+
+
+def sweep(methods, types, sizes=DEFAULT_SIZES, seed=0, maxSeconds=2.0):
+    series = {}
+    for typeArray in types:
+        for method in methods:
+            started = time.perf_counter()
+            series[(method, typeArray)] = measure(method, typeArray, sizes, seed, maxSeconds)
+            print(f"{method} {typeArray}: {len(series[(method, typeArray)])} tamanhos em {time.perf_counter() - started:.1f}s",
+                  file=sys.stderr)
+    return series
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ajusta contagens e tempos a modelos de complexidade e acha os cruzamentos")
+    parser.add_argument('--methods', nargs='+', default=['Insert', 'Shell', 'Merge', 'Heap', 'Tim'])
+    parser.add_argument('--types', nargs='+', default=['OrdA'])
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-seconds', type=float, default=2.0,
+                        help="para de dobrar o tamanho de um método quando uma ordenação passa disso")
+    parser.add_argument('--journal', default=None, help="analisa o diário .jsonl de uma execução do sortMethods em vez de medir")
+    parser.add_argument('--output', default=None, help="grava o relatório neste arquivo (padrão: só na tela)")
+    args = parser.parse_args()
+
+    series = journalSeries(args.journal) if args.journal else sweep(args.methods, args.types, args.sizes, args.seed, args.max_seconds)
+    fits, crossings = analyze(series)
+    writeReport(fits, crossings)
+    if args.output:
+        with open(args.output, 'w') as f:
+            writeReport(fits, crossings, f)
@@ -1,14 +1,22 @@
-import matplotlib.pyplot as plt
 import random
 import time
 
+from result import SortResult
+from lean import lean
+from keyed import keyed
 
+
+def bubbleCosts(n):
+    return (n * (n - 1)) / 2, 1.5 * ((n * (n - 1)) / 2)
+
+
+@keyed
 def bubble(arr):
     n = len(arr)
     comparisons = 0
     movements = 0
 
-    start = time.time()
+    start = time.perf_counter_ns()
 
     for i in range(n):
         for j in range(0, n - i - 1):
@@ -17,29 +25,33 @@ def bubble(arr):
                 arr[j], arr[j + 1] = arr[j + 1], arr[j]
                 movements += 3
 
-    end = time.time()
+    end = time.perf_counter_ns()
 
-    expected_compares = (n * (n - 1)) / 2
-    expected_movements = 1.5 * ((n * (n - 1)) / 2)
+    expected_compares, expected_movements = bubbleCosts(n)
 
     print("\n== BUBBLE SORT ==")
     print(f"Cálculo esperado para comparações: {expected_compares}")
     print(f"Cálculo esperado para movimentos: {expected_movements}")
     print(f"Comparações: {comparisons}")
     print(f"Movimentos: {movements}")
-    print(f"Tempo de execução: {end - start:.6f} segundos")
+    print(f"Tempo de execução: {(end - start) / 1e9:.6f} segundos")
 
-    return comparisons, movements
+    return SortResult(comparisons, movements, end - start)
+
+
+bubble_fast = keyed(lean(bubble)) # mesma implementação, sem contadores e sem prints
 
 
 def plotBubble():
+    import matplotlib.pyplot as plt
+
     sizes = [10, 20, 30, 40, 50, 60, 70, 80, 90, 100, 150, 200, 300, 500, 800, 1000]
     comparisonsList = []
     movementsList = []
 
     for size in sizes:
         arr_random = [random.randint(0, 500) for _ in range(size)]
-        qtdeComparisons, qtdeMovements = bubble(list(arr_random))
+        qtdeComparisons, qtdeMovements, _ = bubble(list(arr_random))
 
         comparisonsList.append(qtdeComparisons)
         movementsList.append(qtdeMovements)
@@ -69,6 +81,7 @@ def plotBubble():
     plt.show()
 
 
-print("Gerando gráficos para Bubble Sort...")
-plotBubble()
-print("Gráficos de Bubble Sort gerados.")
+if __name__ == "__main__":
+    print("Gerando gráficos para Bubble Sort...")
+    plotBubble()
+    print("Gráficos de Bubble Sort gerados.")
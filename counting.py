@@ -0,0 +1,124 @@
+import io
+import time
+import random
+import statistics
+import contextlib
+
+from result import SortResult
+
+
+# contagem sem mexer no laço de cada método: a variante lean ordena elementos embrulhados (que contam as próprias
+# comparações) dentro de uma lista que conta as escritas. 'exact' embrulha todos os elementos; 'sampled' embrulha só
+# uma fração deles numa lista comum e estima o total de comparações, e o resto compara na velocidade de int
+#
+# custo medido com `python counting.py` (1 núcleo, CPython 3.11), em múltiplos do tempo da variante lean; o sampled
+# (10% dos elementos) só estima comparações, porque contar escritas exige o __setitem__ em Python em toda escrita:
+#   método       n        inline   exact   sampled   erro do sampled
+#   Insert       3000     1.8x     8.5x    1.3x      +0.2%
+#   Shell        100000   1.4x     7.3x    1.7x      -0.2%
+#   Merge        100000   1.3x     2.4x    1.7x      -0.2%
+#   Heap         100000   1.0x     5.6x    1.2x      -0.6%
+#   Tim          100000   1.3x     7.2x    1.8x      -0.3%
+# 'movimentos' no exact são as escritas na lista ordenada; buffers auxiliares (merge) não são contados, então o número
+# não bate com o contador inline de cada método, que conta à sua maneira
+
+SAMPLE_RATE = 0.1
+COUNTING_MODES = ('exact', 'sampled', 'off')
+
+
+class OpCounter:
+    __slots__ = ('comparisons', 'movements')
+
+    def __init__(self):
+        self.comparisons = 0
+        self.movements = 0
+
+
+class CountingElement: # compara pelo valor e conta; contra um int solto o Python cai no método refletido, que também conta
+    __slots__ = ('value', 'counter')
+
+    def __init__(self, value, counter):
+        self.value = value
+        self.counter = counter
+
+    def __lt__(self, other):
+        self.counter.comparisons += 1
+        return self.value < (other.value if other.__class__ is CountingElement else other)
+
+    def __le__(self, other):
+        self.counter.comparisons += 1
+        return self.value <= (other.value if other.__class__ is CountingElement else other)
+
+    def __gt__(self, other):
+        self.counter.comparisons += 1
+        return self.value > (other.value if other.__class__ is CountingElement else other)
+
+    def __ge__(self, other):
+        self.counter.comparisons += 1
+        return self.value >= (other.value if other.__class__ is CountingElement else other)
+
+
+class CountingList(list): # conta cada escrita (arr[i] = x ou fatia) como um movimento
+    __slots__ = ('counter',)
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = list(value)
+            self.counter.movements += len(value)
+        else:
+            self.counter.movements += 1
+        list.__setitem__(self, index, value)
+
+
+def countOps(sort, values, mode='exact', rate=SAMPLE_RATE, seed=0): # ordena `values` no lugar com `sort` (de preferência lean) e conta
+    counter = OpCounter()
+    if mode == 'exact':
+        data = CountingList(CountingElement(value, counter) for value in values)
+    elif mode == 'sampled': # lista comum: uma escrita sempre passaria por __setitem__ em Python, que é o que custa caro
+        rng = random.Random(seed)
+        data = [CountingElement(value, counter) if rng.random() < rate else value for value in values]
+    elif mode == 'off':
+        result = sort(values)
+        return SortResult(None, None, result.sort_ns)
+    else:
+        raise ValueError(f"Modo de contagem desconhecido: {mode}")
+    if mode == 'exact':
+        data.counter = counter
+
+    start = time.perf_counter_ns()
+    sort(data)
+    end = time.perf_counter_ns()
+    values[:] = [item.value if item.__class__ is CountingElement else item for item in data]
+
+    if mode == 'sampled':
+        # uma comparação é contada quando pelo menos um dos dois lados está embrulhado: probabilidade 1 - (1 - rate)^2
+        return SortResult(round(counter.comparisons / (rate * (2 - rate))), None, end - start)
+    return SortResult(counter.comparisons, counter.movements, end - start)
+
+
+def benchmarkOverhead(cases=(('Insert', 3000), ('Shell', 100000), ('Merge', 100000), ('Heap', 100000), ('Tim', 100000)),
+                      trials=3): # custo de cada modo em relação à variante lean, nos mesmos vetores
+    from sortMethods import sortFunction
+    from generators import generate
+
+    print("+--------+---------+----------+--------+--------+---------+-------------------+")
+    print("| Method |   Size  | Lean (s) | Inline |  Exact | Sampled | Sampled comps err |")
+    print("+--------+---------+----------+--------+--------+---------+-------------------+")
+    for method, size in cases:
+        data = generate('OrdA', size, 0).tolist()
+        lean, instrumented = sortFunction(method, lean=True), sortFunction(method)
+        with contextlib.redirect_stdout(io.StringIO()):
+            leanTime = statistics.median(lean(list(data)).sort_ns for _ in range(trials))
+            inlineTime = statistics.median(instrumented(list(data)).sort_ns for _ in range(trials))
+        exact = [countOps(lean, list(data), 'exact') for _ in range(trials)]
+        sampled = [countOps(lean, list(data), 'sampled', seed=seed) for seed in range(trials)]
+        error = statistics.mean(r.comparisons for r in sampled) / exact[0].comparisons - 1
+        print("| {:6} | {:7} | {:8.4f} | {:5.1f}x | {:5.1f}x | {:6.1f}x | {:>17} |".format(
+            method, size, leanTime / 1e9, inlineTime / leanTime,
+            statistics.median(r.sort_ns for r in exact) / leanTime, statistics.median(r.sort_ns for r in sampled) / leanTime,
+            f"{error:+.1%}"))
+    print("+--------+---------+----------+--------+--------+---------+-------------------+")
+
+
+if __name__ == "__main__":
+    benchmarkOverhead()
@@ -0,0 +1,184 @@
+import io
+import os
+import time
+import argparse
+import tempfile
+import contextlib
+from array import array as typedArray
+
+from result import SortResult
+from merge import merge_sort_bottom_up
+
+
+# merge sort externo para vetores maiores que a memória: lê o arquivo binário de int64 (o mesmo formato do cache do
+# generators) em pedaços que cabem no orçamento, ordena cada pedaço em memória com um método do projeto, grava os
+# runs ordenados em arquivos temporários e junta tudo com um merge de k vias numa heap, lendo e escrevendo em blocos
+
+ITEM_SIZE = typedArray('q').itemsize
+ELEMENT_FOOTPRINT = 64 # bytes por elemento de um pedaço em memória: slot da lista + objeto int + buffer do merge, com folga
+DEFAULT_MEMORY = 64 * 2 ** 20
+MAX_FAN_IN = 64 # runs abertos ao mesmo tempo por merge; acima disso o merge é feito em mais de uma passada
+IO_BUFFER = 2 ** 20
+
+
+def readBlocks(path, blockSize): # blocos de até blockSize inteiros do arquivo, em ordem
+    with open(path, 'rb', buffering=IO_BUFFER) as f:
+        while True:
+            block = typedArray('q')
+            try:
+                block.fromfile(f, blockSize)
+            except EOFError: # último bloco menor: o fromfile já guardou o que havia
+                pass
+            if not block:
+                return
+            yield block
+
+
+def runValues(path, blockSize): # valores de um run, lidos bloco a bloco
+    for block in readBlocks(path, blockSize):
+        yield from block
+
+
+def siftDown(heap, i): # desce heap[i] numa min-heap de (valor, run); o run desempata, o que mantém o merge estável
+    comparisons = 0
+    movements = 0
+    n = len(heap)
+    item = heap[i]
+    while True:
+        child = 2 * i + 1
+        if child >= n:
+            break
+        if child + 1 < n:
+            comparisons += 1
+            if heap[child + 1] < heap[child]:
+                child += 1
+        comparisons += 1
+        if not heap[child] < item:
+            break
+        heap[i] = heap[child]
+        movements += 1
+        i = child
+    heap[i] = item
+    movements += 1
+    return comparisons, movements
+
+
+def mergeRuns(runs, outputPath, blockSize): # merge de k vias dos runs num único arquivo ordenado
+    comparisons = 0
+    movements = 0
+    sources = [runValues(path, blockSize) for path in runs]
+    heap = [(value, r) for r, value in ((r, next(source, None)) for r, source in enumerate(sources)) if value is not None]
+    for i in reversed(range(len(heap) // 2)):
+        c, m = siftDown(heap, i)
+        comparisons += c
+        movements += m
+
+    out = typedArray('q')
+    with open(outputPath, 'wb', buffering=IO_BUFFER) as f:
+        while heap:
+            value, r = heap[0]
+            out.append(value)
+            movements += 1
+            if len(out) >= blockSize:
+                out.tofile(f)
+                del out[:]
+            following = next(sources[r], None)
+            if following is not None: # o próximo do mesmo run entra no topo e desce
+                heap[0] = (following, r)
+            else: # run esgotado: o último da heap vai para o topo
+                last = heap.pop()
+                if not heap:
+                    break
+                heap[0] = last
+            c, m = siftDown(heap, 0)
+            comparisons += c
+            movements += m
+        out.tofile(f)
+
+    return comparisons, movements
+
+
+def external_merge_sort(inputPath, outputPath, memory_bytes=DEFAULT_MEMORY, sort=merge_sort_bottom_up, tmpdir=None):
+    comparisons = 0
+    movements = 0
+    start = time.perf_counter_ns()
+
+    chunkSize = max(memory_bytes // ELEMENT_FOOTPRINT, 2)
+    n = 0
+    with tempfile.TemporaryDirectory(prefix='external_sort_', dir=tmpdir) as workdir:
+        # fase 1: pedaços do tamanho do orçamento, ordenados em memória e gravados como runs
+        runs = []
+        for block in readBlocks(inputPath, chunkSize):
+            chunk = block.tolist()
+            del block
+            with contextlib.redirect_stdout(io.StringIO()): # sem o relatório de cada pedaço
+                result = sort(chunk)
+            comparisons += result.comparisons or 0
+            movements += result.movements or 0
+            n += len(chunk)
+            runs.append(os.path.join(workdir, f"run{len(runs)}.i64"))
+            with open(runs[-1], 'wb', buffering=IO_BUFFER) as f:
+                typedArray('q', chunk).tofile(f)
+            del chunk
+
+        runCount = len(runs)
+
+        # fase 2: merge de k vias; com muitos runs, em passadas de até MAX_FAN_IN runs cada
+        passes = 0
+        while len(runs) > MAX_FAN_IN:
+            merged = []
+            for g in range(0, len(runs), MAX_FAN_IN):
+                group = runs[g:g + MAX_FAN_IN]
+                merged.append(os.path.join(workdir, f"pass{passes}_{len(merged)}.i64"))
+                c, m = mergeRuns(group, merged[-1], max(memory_bytes // (ITEM_SIZE * (len(group) + 1)), 1))
+                comparisons += c
+                movements += m
+                for path in group:
+                    os.remove(path)
+            runs = merged
+            passes += 1
+        if runs:
+            c, m = mergeRuns(runs, outputPath, max(memory_bytes // (ITEM_SIZE * (len(runs) + 1)), 1))
+            comparisons += c
+            movements += m
+        else: # entrada vazia
+            open(outputPath, 'wb').close()
+
+    end = time.perf_counter_ns()
+
+    print(f"== EXTERNAL MERGE SORT (memória={memory_bytes / 2 ** 20:.1f}MB) ==")
+    print(f"Tamanho do vetor: (n={n})")
+    print(f"Runs: {runCount} de até {chunkSize} elementos, {passes} passada(s) intermediária(s) de merge")
+    print(f"Comparações: {comparisons}")
+    print(f"Movimentos: {movements}")
+    print(f"Tempo: {(end - start) / 1e9:.6f}s")
+
+    return SortResult(comparisons, movements, end - start)
+
+
+def external_sort_list(arr, memory_bytes=DEFAULT_MEMORY, sort=merge_sort_bottom_up, tmpdir=None): # mesma coisa para uma lista já em memória
+    with tempfile.TemporaryDirectory(prefix='external_io_', dir=tmpdir) as workdir:
+        inputPath = os.path.join(workdir, 'input.i64')
+        outputPath = os.path.join(workdir, 'output.i64')
+        with open(inputPath, 'wb') as f:
+            typedArray('q', arr).tofile(f)
+        result = external_merge_sort(inputPath, outputPath, memory_bytes, sort, tmpdir)
+        arr[:] = [value for block in readBlocks(outputPath, 2 ** 16) for value in block]
+    return result
+
+
+def parseBytes(text): # '512K', '64M', '2G' ou bytes
+    units = {'K': 2 ** 10, 'M': 2 ** 20, 'G': 2 ** 30}
+    if text[-1:].upper() in units:
+        return int(float(text[:-1]) * units[text[-1].upper()])
+    return int(text)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ordena um arquivo binário de int64 maior que a memória")
+    parser.add_argument('input')
+    parser.add_argument('output')
+    parser.add_argument('--memory', type=parseBytes, default=DEFAULT_MEMORY, help="orçamento de memória (ex.: 256M)")
+    parser.add_argument('--tmpdir', default=None, help="onde gravar os runs temporários")
+    args = parser.parse_args()
+    external_merge_sort(args.input, args.output, args.memory, tmpdir=args.tmpdir)
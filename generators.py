@@ -0,0 +1,129 @@
+import os
+import mmap
+import random
+import itertools
+import contextlib
+from array import array as typedArray
+
+
+# geradores de vetor de entrada: todos recebem (size, rng, param) e devolvem um array('q'), 8 bytes por elemento em vez
+# dos ~36 de uma lista de int; o tipo no input pode levar um parâmetro depois de ':' (ex.: NearlySorted:50, Zipf:1.5),
+# já convertido e conferido pelo parseType (None quando omitido)
+
+DATASET_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dataset_cache')
+CACHE_MIN_SIZE = 100000 # abaixo disso gerar de novo é mais barato que ler do disco
+
+
+def ascending(size, rng, param): # OrdC
+    return typedArray('q', range(size))
+
+
+def descending(size, rng, param): # OrdD
+    return typedArray('q', range(size, 0, -1))
+
+
+def randomDistinct(size, rng, param): # OrdA: distintos entre 0 e 10*size, como antes, agora com semente
+    return typedArray('q', rng.sample(range(size * 10), size))
+
+
+def nearlySorted(size, rng, param): # crescente com k trocas aleatórias (padrão: 1% do tamanho)
+    values = typedArray('q', range(size))
+    k = param if param is not None else max(size // 100, 1)
+    for _ in range(k if size > 1 else 0):
+        i, j = rng.randrange(size), rng.randrange(size)
+        values[i], values[j] = values[j], values[i]
+    return values
+
+
+def fewUnique(size, rng, param): # só k valores diferentes (padrão: 10)
+    k = param if param is not None else 10
+    return typedArray('q', (rng.randrange(k) for _ in range(size)))
+
+
+def organPipe(size, rng, param): # sobe até o meio e desce: 0 1 2 ... 2 1 0
+    return typedArray('q', (min(i, size - 1 - i) for i in range(size)))
+
+
+def sawtooth(size, rng, param): # t dentes crescentes em sequência (padrão: 8)
+    period = max(-(-size // (param if param is not None else 8)), 1)
+    return typedArray('q', (i % period for i in range(size)))
+
+
+def zipfian(size, rng, param): # valor k com probabilidade proporcional a 1/k^s (padrão s=1.1): poucos valores dominam
+    s = param if param is not None else 1.1
+    if size == 0:
+        return typedArray('q')
+    weights = list(itertools.accumulate(1 / k ** s for k in range(1, size + 1)))
+    return typedArray('q', rng.choices(range(1, size + 1), cum_weights=weights, k=size))
+
+
+def allEqual(size, rng, param):
+    return typedArray('q', itertools.repeat(0, size))
+
+
+GENERATORS = {
+    'OrdC': ascending,
+    'OrdD': descending,
+    'OrdA': randomDistinct,
+    'NearlySorted': nearlySorted,
+    'FewUnique': fewUnique,
+    'OrganPipe': organPipe,
+    'Sawtooth': sawtooth,
+    'Zipf': zipfian,
+    'AllEqual': allEqual,
+}
+
+
+PARAMETERS = { # tipos que aceitam parâmetro: (conversão, menor valor válido)
+    'NearlySorted': (int, 0),
+    'FewUnique': (int, 1),
+    'Sawtooth': (int, 1),
+    'Zipf': (float, 0.0),
+}
+
+
+def parseType(typeArray): # 'NearlySorted:50' -> (nearlySorted, 50); parâmetro inválido é ValueError aqui, não no gerador
+    name, _, param = typeArray.partition(':')
+    if name not in GENERATORS:
+        raise ValueError(f"Tipo de vetor desconhecido: {typeArray}")
+    if not param:
+        return GENERATORS[name], None
+    if name not in PARAMETERS:
+        raise ValueError(f"Tipo de vetor sem parâmetro: {typeArray}")
+    convert, minimum = PARAMETERS[name]
+    value = convert(param) # ValueError para 'abc'
+    if not value >= minimum: # o `not` também recusa nan
+        raise ValueError(f"Parâmetro de {name} deve ser >= {minimum}: {param}")
+    return GENERATORS[name], value
+
+
+def generate(typeArray, size, seed=None): # mesma (tipo, tamanho, semente) gera sempre o mesmo vetor; sem semente, aleatório
+    generator, param = parseType(typeArray)
+    return generator(size, random.Random(seed), param)
+
+
+def cachePath(typeArray, size, seed, cacheDir=DATASET_CACHE):
+    return os.path.join(cacheDir, f"{typeArray.replace(':', '-')}_{size}_{seed}.i64")
+
+
+@contextlib.contextmanager
+def dataset(typeArray, size, seed=None, cacheDir=DATASET_CACHE): # o vetor como memoryview de int64
+    # vetores grandes com semente são gerados uma vez e depois só mapeados do disco, em qualquer método que os use
+    if seed is None or size < CACHE_MIN_SIZE:
+        yield memoryview(generate(typeArray, size, seed))
+        return
+
+    path = cachePath(typeArray, size, seed, cacheDir)
+    if not os.path.exists(path):
+        os.makedirs(cacheDir, exist_ok=True)
+        partial = f"{path}.{os.getpid()}.tmp" # escreve ao lado e renomeia: nunca fica um arquivo pela metade no cache
+        with open(partial, 'wb') as f:
+            generate(typeArray, size, seed).tofile(f)
+        os.replace(partial, path)
+
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        view = memoryview(mapped).cast('q')
+        try:
+            yield view
+        finally:
+            view.release()
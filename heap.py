@@ -1,13 +1,23 @@
-import matplotlib.pyplot as plt
 import random
 import time
+import math
+import itertools
 
+from result import SortResult
+from lean import lean
+from keyed import keyed
 
+
+def heapCosts(n): # Aproximação O(n log n)
+    return (2 * n * (n.bit_length() - 1) if n > 1 else 0), (3 * n * (n.bit_length() - 1) if n > 1 else 0)
+
+
+@keyed
 def heap(arr):
     n = len(arr)
     comparisons = 0
     movements = 0
-    start = time.time()
+    start = time.perf_counter_ns()
 
     def heapify(sub, i, n): # organiza a heap baseando no maxHeap
         nonlocal comparisons, movements
@@ -40,10 +50,9 @@ def heap(arr):
         movements += 3
         heapify(arr, 0, i)
 
-    end = time.time()
+    end = time.perf_counter_ns()
 
-    expected_compares = 2 * n * (n.bit_length() - 1) if n > 1 else 0  # Aproximação O(n log n)
-    expected_movements = 3 * n * (n.bit_length() - 1) if n > 1 else 0
+    expected_compares, expected_movements = heapCosts(n)
 
     print(f"== HEAP SORT ==")
     print(f"Cálculo esperado para comparações: {expected_compares}")
@@ -51,19 +60,96 @@ def heap(arr):
     print(f"Tamanho do vetor: (n={len(arr)})")
     print(f"Comparações: {comparisons}")
     print(f"Movimentos: {movements}")
-    print(f"Tempo: {end - start:.6f}s")
+    print(f"Tempo: {(end - start) / 1e9:.6f}s")
+
+    return SortResult(comparisons, movements, end - start)
+
+
+heap_fast = keyed(lean(heap)) # mesma implementação, sem contadores e sem prints
+
+
+def heapFloydCosts(n, d=2): # Aproximação: descida até a folha domina
+    levels = math.log(n, d) if n > 1 else 0
+    return round((d - 1) * n * levels), round(n * levels)
+
+
+def heap_floyd(arr, d=2):
+    n = len(arr)
+    comparisons = 0
+    movements = 0
+    start = time.perf_counter_ns()
+
+    # mesma heap de máximo, mas iterativa (sem recursão nem closure) e com d filhos por nó;
+    # primeiro os passos de montagem da heap, depois os de ordenação, todos com o mesmo peneiramento
+    build = ((i, n) for i in range((n - 2) // d, -1, -1))
+    extract = ((0, last) for last in range(n - 1, 0, -1))
+    for root, size in itertools.chain(build, extract):
+        if size < n: # ordenação: o máximo vai para o fim e o último elemento é reinserido a partir da raiz
+            x = arr[size]
+            arr[size] = arr[0]
+            movements += 2
+        else:
+            x = arr[root]
+            movements += 1
+
+        # Floyd: desce o buraco até a folha sempre pelo maior filho, sem comparar com x...
+        hole = root
+        child = d * hole + 1
+        while child < size:
+            lastChild = child + d if child + d < size else size
+            largest = child
+            c = child + 1
+            while c < lastChild:
+                comparisons += 1
+                if arr[c] > arr[largest]:
+                    largest = c
+                c += 1
+            arr[hole] = arr[largest]
+            movements += 1
+            hole = largest
+            child = d * hole + 1
+
+        # ...e depois sobe x a partir da folha, o que costuma parar em poucos níveis
+        while hole > root:
+            parent = (hole - 1) // d
+            comparisons += 1
+            if arr[parent] < x:
+                arr[hole] = arr[parent]
+                movements += 1
+                hole = parent
+            else:
+                break
+        arr[hole] = x
+        movements += 1
+
+    end = time.perf_counter_ns()
+
+    expected_compares, expected_movements = heapFloydCosts(n, d)
+
+    print(f"== HEAP SORT (FLOYD, d={d}) ==")
+    print(f"Cálculo esperado para comparações: {expected_compares}")
+    print(f"Cálculo esperado para movimentos: {expected_movements}")
+    print(f"Tamanho do vetor: (n={n})")
+    print(f"Comparações: {comparisons}")
+    print(f"Movimentos: {movements}")
+    print(f"Tempo: {(end - start) / 1e9:.6f}s")
 
-    return comparisons, movements
+    return SortResult(comparisons, movements, end - start)
+
+
+heap_floyd_fast = lean(heap_floyd)
 
 
 def plotHeapSort():
+    import matplotlib.pyplot as plt
+
     sizes = [10, 20, 30, 40, 50, 60, 70, 80, 90, 100, 150, 200, 300, 500, 800, 1000]
     comparisonsList = []
     movementsList = []
 
     for size in sizes:
         arr_random = [random.randint(0, 1000) for _ in range(size)]
-        qtdeComparisons, qtdeMovements = heap(list(arr_random))
+        qtdeComparisons, qtdeMovements, _ = heap(list(arr_random))
 
         comparisonsList.append(qtdeComparisons)
         movementsList.append(qtdeMovements)
@@ -96,4 +182,4 @@ def plotHeapSort():
 if __name__ == "__main__":
     print("Gerando gráficos para Heap Sort...")
     plotHeapSort()
-    print("Gráficos de Heap Sort gerados.")
\ No newline at end of file
+    print("Gráficos de Heap Sort gerados.")
@@ -0,0 +1,233 @@
+import os
+import json
+import math
+import time
+import random
+import platform
+import statistics
+
+from result import SortResult
+from lean import lean
+from insertion import insertion_range, insertion_range_fast
+
+
+# híbridos merge + inserção: os pedaços pequenos vão para a inserção, que ganha do merge abaixo de algumas dezenas
+# de elementos; o corte ideal depende da máquina e fica guardado em disco pelo tuneCutoff
+
+CUTOFF_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cutoff_cache.json')
+
+
+def merge_runs(arr, aux, lo, mid, hi): # junta arr[lo:mid] e arr[mid:hi], já ordenados, guardando só a metade esquerda em aux
+    comparisons = 1
+    movements = 0
+    if arr[mid - 1] <= arr[mid]: # os dois pedaços já estão em ordem
+        return comparisons, movements
+
+    size = mid - lo
+    aux[:size] = arr[lo:mid]
+    i, j, out = 0, mid, lo
+    while i < size and j < hi:
+        comparisons += 1
+        if aux[i] <= arr[j]: # empate fica com a esquerda: estável
+            arr[out] = aux[i]
+            i += 1
+        else:
+            arr[out] = arr[j]
+            j += 1
+        movements += 1
+        out += 1
+
+    # o que sobrou da esquerda volta do aux; o que sobrou da direita já está no lugar
+    arr[out:out + size - i] = aux[i:size]
+    movements += size - i
+
+    return comparisons, movements
+
+
+merge_runs_fast = lean(merge_runs)
+
+
+def mergeInsertionCosts(n, cutoff):
+    cost = n * max(math.log2(n / cutoff), 0) + n * (cutoff - 1) / 4 if n > 1 else 0
+    return cost, cost
+
+
+def merge_insertion(arr, cutoff=None):
+    n = len(arr)
+    cutoff = max(cachedCutoff() if cutoff is None else cutoff, 1)
+    comparisons = 0
+    movements = 0
+    start = time.perf_counter_ns()
+
+    aux = [None] * (n // 2 + 1)
+
+    def sort_range(lo, hi): # merge sort de cima para baixo em arr[lo:hi], sem fatiar
+        nonlocal comparisons, movements
+        if hi - lo <= cutoff:
+            c, m = insertion_range(arr, lo, hi)
+            comparisons += c
+            movements += m
+            return
+        mid = (lo + hi) // 2
+        sort_range(lo, mid)
+        sort_range(mid, hi)
+        c, m = merge_runs(arr, aux, lo, mid, hi)
+        comparisons += c
+        movements += m
+
+    sort_range(0, n)
+
+    end = time.perf_counter_ns()
+
+    expected_compares, expected_movements = mergeInsertionCosts(n, cutoff)
+
+    print(f"== MERGE + INSERTION SORT (cutoff={cutoff}) ==")
+    print(f"Cálculo esperado para comparações: {expected_compares:.0f}")
+    print(f"Cálculo esperado para movimentos: {expected_movements:.0f}")
+    print(f"Tamanho do vetor: (n={n})")
+    print(f"Comparações: {comparisons}")
+    print(f"Movimentos: {movements}")
+    print(f"Tempo: {(end - start) / 1e9:.6f}s")
+
+    return SortResult(comparisons, movements, end - start)
+
+
+merge_insertion_fast = lean(merge_insertion)
+
+
+def minRun(n): # mesmo cálculo do Timsort do CPython: n / minrun fica um pouco abaixo de uma potência de 2
+    extra = 0
+    while n >= 64:
+        extra |= n & 1
+        n >>= 1
+    return n + extra
+
+
+def timsortCosts(n): # pior caso; OrdC/OrdD custam só n - 1
+    return (n * math.ceil(math.log2(n)) if n > 1 else 0), (n * math.ceil(math.log2(n)) if n > 1 else 0)
+
+
+def timsort(arr, minrun=None):
+    n = len(arr)
+    minrun = minRun(n) if minrun is None else minrun
+    comparisons = 0
+    movements = 0
+    start = time.perf_counter_ns()
+
+    aux = [None] * n
+    runs = [] # pilha de (início, tamanho) dos runs ainda não juntados
+    lo = 0
+    while lo < n:
+        # run natural: crescente, ou estritamente decrescente (que é invertido, sem quebrar a estabilidade)
+        hi = lo + 1
+        if hi < n:
+            comparisons += 1
+            descending = arr[hi] < arr[lo]
+            hi += 1
+            while hi < n:
+                comparisons += 1
+                if (arr[hi] < arr[hi - 1]) != descending:
+                    break
+                hi += 1
+            if descending:
+                arr[lo:hi] = arr[lo:hi][::-1]
+                movements += hi - lo
+
+        # run curto é estendido até minrun com a inserção
+        if hi - lo < minrun:
+            forced = min(lo + minrun, n)
+            c, m = insertion_range(arr, lo, forced, hi)
+            comparisons += c
+            movements += m
+            hi = forced
+
+        runs.append((lo, hi - lo))
+        lo = hi
+
+        # mantém os invariantes do Timsort (já com a correção de 2015) para os merges ficarem balanceados
+        while len(runs) > 1:
+            k = len(runs) - 2
+            if (k > 0 and runs[k - 1][1] <= runs[k][1] + runs[k + 1][1]) or \
+                    (k > 1 and runs[k - 2][1] <= runs[k - 1][1] + runs[k][1]):
+                if runs[k - 1][1] < runs[k + 1][1]:
+                    k -= 1
+            elif runs[k][1] > runs[k + 1][1]:
+                break
+            (start1, size1), (start2, size2) = runs[k], runs[k + 1]
+            c, m = merge_runs(arr, aux, start1, start2, start2 + size2)
+            comparisons += c
+            movements += m
+            runs[k:k + 2] = [(start1, size1 + size2)]
+
+    while len(runs) > 1: # junta o que sobrou na pilha
+        k = len(runs) - 2
+        if k > 0 and runs[k - 1][1] < runs[k + 1][1]:
+            k -= 1
+        (start1, size1), (start2, size2) = runs[k], runs[k + 1]
+        c, m = merge_runs(arr, aux, start1, start2, start2 + size2)
+        comparisons += c
+        movements += m
+        runs[k:k + 2] = [(start1, size1 + size2)]
+
+    end = time.perf_counter_ns()
+
+    expected_compares, expected_movements = timsortCosts(n)
+
+    print(f"== TIMSORT (minrun={minrun}) ==")
+    print(f"Cálculo esperado para comparações: {expected_compares}")
+    print(f"Cálculo esperado para movimentos: {expected_movements}")
+    print(f"Tamanho do vetor: (n={n})")
+    print(f"Comparações: {comparisons}")
+    print(f"Movimentos: {movements}")
+    print(f"Tempo: {(end - start) / 1e9:.6f}s")
+
+    return SortResult(comparisons, movements, end - start)
+
+
+timsort_fast = lean(timsort)
+
+
+def machineKey(): # o corte é medido por máquina e por versão do Python
+    return f"{platform.node()}|{platform.machine()}|{platform.python_implementation()} {platform.python_version()}"
+
+
+def tuneCutoff(size=20000, candidates=(4, 8, 12, 16, 24, 32, 48, 64, 96, 128), trials=5): # mede e guarda o melhor corte
+    data = random.Random(0).sample(range(size * 10), size)
+    timings = {}
+    for cutoff in candidates:
+        timings[cutoff] = statistics.median(merge_insertion_fast(list(data), cutoff).sort_ns for _ in range(trials))
+        print(f"cutoff={cutoff:4}: {timings[cutoff] / 1e9:.6f}s")
+    best = min(timings, key=timings.get)
+
+    cache = readCutoffCache()
+    cache[machineKey()] = best
+    try:
+        with open(CUTOFF_CACHE, 'w') as f:
+            json.dump(cache, f, indent=2)
+        print(f"Melhor cutoff nesta máquina: {best} (salvo em {CUTOFF_CACHE})")
+    except OSError as e:
+        print(f"Melhor cutoff nesta máquina: {best} (não foi possível salvar: {e})")
+    return best
+
+
+def readCutoffCache():
+    try:
+        with open(CUTOFF_CACHE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+tunedCutoff = None # o corte lido ou medido neste processo; o arquivo só poupa a medição nos próximos processos
+
+
+def cachedCutoff(): # corte salvo para esta máquina; mede na primeira vez, mesmo se não der para gravar o arquivo
+    global tunedCutoff
+    if tunedCutoff is None:
+        cutoff = readCutoffCache().get(machineKey())
+        tunedCutoff = cutoff if cutoff is not None else tuneCutoff()
+    return tunedCutoff
+
+
+if __name__ == "__main__":
+    tuneCutoff()
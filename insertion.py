@@ -1,14 +1,22 @@
-import matplotlib.pyplot as plt
 import random
 import time
 
+from result import SortResult
+from lean import lean
+from keyed import keyed
 
+
+def insertionCosts(n): # comparações e movimentos esperados no caso médio
+    return (n * (n - 1)) / 4, (n ** 2) / 4 + (11 * n) / 4 - 3
+
+
+@keyed
 def insertion(arr):
     n = len(arr)
     comparisons = 0
     movements = 0
 
-    start = time.time()
+    start = time.perf_counter_ns()
 
     for i in range(1, n):
         key = arr[i]
@@ -25,29 +33,58 @@ def insertion(arr):
         arr[j + 1] = key
         movements += 1
 
-    end = time.time()
+    end = time.perf_counter_ns()
 
-    expected_compares = (n * (n - 1)) / 4  
-    expected_movements = (n ** 2) / 4 + (11 * n) / 4 - 3
+    expected_compares, expected_movements = insertionCosts(n)
 
     print("\n== INSERTION SORT ==")
     print(f"Cálculo esperado para comparações: {expected_compares}")
     print(f"Cálculo esperado para movimentos: {expected_movements}")
     print(f"Comparações: {comparisons}")
     print(f"Movimentos: {movements}")
-    print(f"Tempo de execução: {end - start:.6f} segundos")
+    print(f"Tempo de execução: {(end - start) / 1e9:.6f} segundos")
+
+    return SortResult(comparisons, movements, end - start)
+
+
+insertion_fast = keyed(lean(insertion)) # mesma implementação, sem contadores e sem prints
+
+
+def insertion_range(arr, lo, hi, start=None): # inserção só em arr[lo:hi], sem prints; arr[lo:start] já está ordenado
+    comparisons = 0
+    movements = 0
+
+    for i in range(lo + 1 if start is None else max(start, lo + 1), hi):
+        key = arr[i]
+        movements += 1
+        j = i - 1
+        while j >= lo:
+            comparisons += 1
+            if key < arr[j]:
+                arr[j + 1] = arr[j]
+                movements += 1
+                j -= 1
+            else:
+                break
+        arr[j + 1] = key
+        movements += 1
 
     return comparisons, movements
 
 
+insertion_range_fast = lean(insertion_range)
+
+
 def plotInsertion():
+    import matplotlib.pyplot as plt
+
     sizes = [10, 20, 30, 40, 50, 60, 70, 80, 90, 100, 150, 200, 300, 500, 800, 1000]
     comparisonsList = []
     movementsList = []
 
     for size in sizes:
         arr_random = [random.randint(0, 500) for _ in range(size)]
-        qtdeComparisons, qtdeMovements = insertion(list(arr_random))
+        qtdeComparisons, qtdeMovements, _ = insertion(list(arr_random))
 
         comparisonsList.append(qtdeComparisons)
         movementsList.append(qtdeMovements)
@@ -77,6 +114,7 @@ def plotInsertion():
     plt.show()
 
 
-print("Gerando gráficos para Insertion Sort...")
-plotInsertion()
-print("Gráficos de Insertion Sort gerados.")
\ No newline at end of file
+if __name__ == "__main__":
+    print("Gerando gráficos para Insertion Sort...")
+    plotInsertion()
+    print("Gráficos de Insertion Sort gerados.")
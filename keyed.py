@@ -0,0 +1,152 @@
+import io
+import time
+import random
+import argparse
+import operator
+import functools
+import contextlib
+import dataclasses
+
+
+# key= e reverse= para os métodos de ordenação, no esquema decorar-ordenar-desdecorar: a chave é calculada uma vez por
+# elemento e o método ordena tuplas (chave, índice, elemento). O índice desempata chaves iguais, então o elemento em si
+# nunca é comparado (records sem ordem natural funcionam) e a ordenação com chave é sempre estável, mesmo em selection,
+# shell e heap, que sem chave não são. Com reverse=True o índice entra como n - i e a lista é invertida no final, o que
+# mantém os empates na ordem original, como o sorted(..., reverse=True) do Python.
+#
+# sem key nem reverse, o método roda direto nos elementos: insertion, bubble e merge_sort são estáveis; selection,
+# shell e heap não são.
+
+
+def keyed(sort): # acrescenta key= e reverse= a um método que ordena a lista no lugar e devolve SortResult
+    @functools.wraps(sort)
+    def sortWithKey(arr, *args, key=None, reverse=False, **kwargs):
+        if key is None and not reverse:
+            return sort(arr, *args, **kwargs)
+        key = key or (lambda item: item)
+        n = len(arr)
+        decorated = [(key(item), n - i if reverse else i, item) for i, item in enumerate(arr)]
+        result = sort(decorated, *args, **kwargs)
+        if reverse:
+            decorated.reverse()
+        arr[:] = [item for _, _, item in decorated]
+        return result
+
+    return sortWithKey
+
+
+@dataclasses.dataclass
+class Record: # registro de exemplo para o benchmark: sem ordem natural, só ordenável por chave
+    name: str
+    score: int
+    weight: float
+
+
+class CompareByKey: # o jeito ingênuo: a chave é recalculada a cada comparação
+    __slots__ = ('item', 'key')
+
+    def __init__(self, item, key):
+        self.item = item
+        self.key = key
+
+    def __lt__(self, other):
+        return self.key(self.item) < self.key(other.item)
+
+    def __le__(self, other):
+        return self.key(self.item) <= self.key(other.item)
+
+    def __gt__(self, other):
+        return self.key(self.item) > self.key(other.item)
+
+    def __ge__(self, other):
+        return self.key(self.item) >= self.key(other.item)
+
+
+def sorters(): # os seis métodos com key=, na variante sem contadores e sem prints
+    from insertion import insertion_fast
+    from shell import shell_fast
+    from selection import selection_fast
+    from heap import heap_fast
+    from merge import merge_sort_fast
+    from bubble import bubble_fast
+    return {'Insert': insertion_fast, 'Shell': shell_fast, 'Select': selection_fast, 'Heap': heap_fast,
+            'Merge': merge_sort_fast, 'Bubble': bubble_fast}
+
+
+def checkStability(size=300, seed=0): # cada método com key/reverse tem que bater com o sorted do Python, inclusive nos empates
+    # devolve os casos que falharam; o `python keyed.py` sai com código 1 se houver algum
+    from registry import algorithms
+
+    rng = random.Random(seed)
+    records = [Record(f"r{i}", rng.randrange(10), rng.random()) for i in range(size)]
+    score = operator.attrgetter('score')
+    failures = []
+    for name, sort in sorters().items():
+        for reverse in (False, True):
+            data = list(records)
+            sort(data, key=score, reverse=reverse)
+            expected = sorted(records, key=score, reverse=reverse)
+            ok = all(a is b for a, b in zip(data, expected))
+            print(f"{name:14} key=score reverse={reverse!s:5}: {'ok' if ok else 'FALHOU'}")
+            if not ok:
+                failures.append(f"{name} key=score reverse={reverse}")
+
+    # sem key=, os métodos registrados como estáveis têm que manter a ordem dos empates por conta própria
+    expected = sorted(records, key=score)
+    for name, entry in algorithms().items():
+        if not entry.stable or entry.kind != 'list':
+            continue
+        data = [CompareByKey(record, score) for record in records]
+        with contextlib.redirect_stdout(io.StringIO()):
+            entry.function(lean=True)(data)
+        ok = all(a.item is b for a, b in zip(data, expected))
+        print(f"{name:14} sem key (empates)      : {'ok' if ok else 'FALHOU'}")
+        if not ok:
+            failures.append(f"{name} sem key")
+    return failures
+
+
+def benchmarkKeys(cases=(('Insert', 2000), ('Select', 2000), ('Shell', 50000), ('Heap', 50000), ('Merge', 50000)), trials=3):
+    # chave calculada uma vez (decorar-ordenar-desdecorar) contra chave recalculada em cada comparação
+    rng = random.Random(0)
+    inputs = {
+        'tuple': ([(f"r{i}", rng.randrange(1000), rng.random()) for i in range(max(size for _, size in cases))],
+                  operator.itemgetter(1)),
+        'dataclass': ([Record(f"r{i}", rng.randrange(1000), rng.random()) for i in range(max(size for _, size in cases))],
+                      lambda record: (record.score, record.name)),
+    }
+    table = sorters()
+
+    print("+--------+---------+-----------+-----------------+----------------+---------+")
+    print("| Method |   Size  |  Element  | Per-compare (s) | Cached key (s) | Speedup |")
+    print("+--------+---------+-----------+-----------------+----------------+---------+")
+    for method, size in cases:
+        sort = table[method]
+        for kind, (items, key) in inputs.items():
+            data = items[:size]
+            naive, cached = [], []
+            for _ in range(trials):
+                wrapped = [CompareByKey(item, key) for item in data]
+                start = time.perf_counter()
+                sort(wrapped)
+                naive.append(time.perf_counter() - start)
+
+                copy = list(data)
+                start = time.perf_counter()
+                sort(copy, key=key)
+                cached.append(time.perf_counter() - start)
+            print("| {:6} | {:7} | {:9} | {:15.4f} | {:14.4f} | {:6.1f}x |".format(
+                method, size, kind, min(naive), min(cached), min(naive) / min(cached)))
+    print("+--------+---------+-----------+-----------------+----------------+---------+")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Estabilidade dos métodos com e sem key= e custo da chave por comparação")
+    parser.add_argument('--check', action='store_true', help="só confere a estabilidade, sem o benchmark")
+    args = parser.parse_args()
+    failures = checkStability()
+    if failures:
+        print(f"Estabilidade quebrada em: {', '.join(failures)}")
+        raise SystemExit(1)
+    if not args.check:
+        benchmarkKeys()
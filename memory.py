@@ -0,0 +1,75 @@
+import os
+import sys
+import tracemalloc
+
+try:
+    import resource
+except ImportError: # Windows: sem getrusage, o pico de RSS fica de fora
+    resource = None
+
+
+# memória de cada job, medida no processo filho em volta da ordenação cronometrada:
+#   'rss': pico de RSS do processo (getrusage) e quanto ele cresceu durante a ordenação; custo zero no laço
+#   'tracemalloc': além disso, uma passada a mais da variante lean numa cópia do vetor com o tracemalloc ligado, que dá
+#                  o pico de bytes alocados pela ordenação (o vetor de entrada não entra); fica fora do tempo medido,
+#                  porque o tracemalloc deixa cada alocação bem mais lenta
+#   'off': nada
+# o crescimento de RSS subestima um pouco: memória liberada antes (aquecimento) é reaproveitada sem aparecer no RSS
+
+MEMORY_MODES = ('rss', 'tracemalloc', 'off')
+MAXRSS_UNIT = 1 if sys.platform == 'darwin' else 1024 # ru_maxrss vem em bytes no macOS e em KB no Linux
+
+
+def currentRss(): # RSS atual em bytes; None fora do Linux
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return None
+
+
+def resetPeak(): # zera o pico de RSS do processo (Linux >= 4.0), para medir só o que vem depois
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def peakRss(): # pico de RSS em bytes desde o início do processo ou do último resetPeak
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * MAXRSS_UNIT
+
+
+def startRss(): # chamado logo antes da ordenação: (RSS atual, se o pico foi zerado)
+    return currentRss(), resetPeak()
+
+
+def finishRss(before): # dicionário com o pico e o crescimento de RSS durante a ordenação
+    rss, reset = before
+    peak = peakRss()
+    # sem o reset, o pico pode ser de antes da ordenação (a carga do vetor) e o crescimento não é confiável
+    growth = max(peak - rss, 0) if peak is not None and rss is not None and reset else None
+    return {'peak_rss': peak, 'rss_growth': growth, 'alloc_peak': None}
+
+
+def allocationPeak(sort, values): # pico de bytes alocados por sort(values), sem contar o próprio vetor
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    sort(values)
+    peak = tracemalloc.get_traced_memory()[1] - base
+    if not tracing:
+        tracemalloc.stop()
+    return max(peak, 0)
+
+
+def bytesPerElement(memory, n): # memória extra por elemento: pico alocado se medido, senão crescimento do RSS
+    if memory is None or not n:
+        return None
+    extra = memory['alloc_peak'] if memory['alloc_peak'] is not None else memory['rss_growth']
+    return extra / n if extra is not None else None
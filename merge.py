@@ -1,14 +1,26 @@
-import matplotlib.pyplot as plt
 import random
 import time
 import math
 
+from result import SortResult
+from lean import lean
+from keyed import keyed
+from insertion import insertion_range, insertion_range_fast
 
+
+MIN_RUN = 32 # menor run do merge bottom-up; os mais curtos são completados com a inserção
+
+
+def mergeCosts(n): # vale para as duas versões: n comparações/movimentos por nível
+    return (n * math.ceil(math.log2(n)) if n > 1 else 0), (n * math.ceil(math.log2(n)) if n > 1 else 0)
+
+
+@keyed
 def merge_sort(arr):
     n = len(arr)
     comparisons = 0
     movements = 0
-    start = time.time()
+    start = time.perf_counter_ns()
 
     def merge(left, right): # junta 2 pedaços em um só
         nonlocal comparisons, movements
@@ -50,11 +62,10 @@ def merge_sort(arr):
         arr[i] = sorted_arr[i]
         movements += 1
 
-    end = time.time()
+    end = time.perf_counter_ns()
 
     n = len(arr)
-    expected_compares = n * math.ceil(math.log2(n)) if n > 1 else 0
-    expected_movements = n * math.ceil(math.log2(n)) if n > 1 else 0
+    expected_compares, expected_movements = mergeCosts(n)
 
     print(f"== MERGE SORT ==")
     print(f"Cálculo esperado para comparações: {expected_compares}")
@@ -62,17 +73,121 @@ def merge_sort(arr):
     print(f"Tamanho do vetor: (n={len(arr)})")
     print(f"Comparações: {comparisons}")
     print(f"Movimentos: {movements}")
-    print(f"Tempo: {end - start:.6f}s")
+    print(f"Tempo: {(end - start) / 1e9:.6f}s")
+
+    return SortResult(comparisons, movements, end - start)
+
+
+merge_sort_fast = keyed(lean(merge_sort)) # mesma implementação, sem contadores e sem prints
 
-    return comparisons, movements
+
+def merge_sort_bottom_up(arr):
+    n = len(arr)
+    comparisons = 0
+    movements = 0
+    start = time.perf_counter_ns()
+
+    # detecta os trechos já ordenados (runs): crescentes, ou estritamente decrescentes, que são invertidos no lugar
+    # sem quebrar a estabilidade; no OrdC sai um run só e nada é movido. Run curto é estendido até MIN_RUN com a
+    # inserção, então a lista de fronteiras tem no máximo n / MIN_RUN + 1 posições
+    runs = [0]
+    lo = 0
+    while lo < n:
+        hi = lo + 1
+        if hi < n:
+            comparisons += 1
+            descending = arr[hi] < arr[lo]
+            hi += 1
+            while hi < n:
+                comparisons += 1
+                if (arr[hi] < arr[hi - 1]) != descending:
+                    break
+                hi += 1
+            if descending:
+                i, j = lo, hi - 1
+                while i < j:
+                    arr[i], arr[j] = arr[j], arr[i]
+                    i += 1
+                    j -= 1
+                movements += hi - lo
+        if hi - lo < MIN_RUN and hi < n:
+            forced = min(lo + MIN_RUN, n)
+            c, m = insertion_range(arr, lo, forced, hi)
+            comparisons += c
+            movements += m
+            hi = forced
+        runs.append(hi)
+        lo = hi
+
+    # junta os runs dois a dois alternando entre arr e um único buffer auxiliar, sem fatiar nem criar listas; as
+    # fronteiras da próxima passada são regravadas no começo da própria lista. Com um run só o buffer nem é criado
+    src = arr
+    dst = [None] * n if len(runs) > 2 else None
+    while len(runs) > 2:
+        w = 1
+        for k in range(0, len(runs) - 1, 2):
+            lo = runs[k]
+            mid = runs[k + 1]
+            hi = runs[k + 2] if k + 2 < len(runs) else mid # run sem par só é copiado
+            i, j, out = lo, mid, lo
+            while i < mid and j < hi:
+                comparisons += 1
+                if src[i] <= src[j]:
+                    dst[out] = src[i]
+                    i += 1
+                else:
+                    dst[out] = src[j]
+                    j += 1
+                movements += 1
+                out += 1
+
+            while i < mid:
+                dst[out] = src[i]
+                movements += 1
+                i += 1
+                out += 1
+            while j < hi:
+                dst[out] = src[j]
+                movements += 1
+                j += 1
+                out += 1
+            runs[w] = hi # w <= k: nenhuma fronteira ainda não lida é sobrescrita
+            w += 1
+        del runs[w:]
+        src, dst = dst, src
+
+    # Copia o array ordenado de volta para o original quando a última passada terminou no buffer
+    if src is not arr:
+        for i in range(n):
+            arr[i] = src[i]
+            movements += 1
+
+    end = time.perf_counter_ns()
+
+    expected_compares, expected_movements = mergeCosts(n)
+
+    print(f"== MERGE SORT (BOTTOM-UP) ==")
+    print(f"Cálculo esperado para comparações: {expected_compares}")
+    print(f"Cálculo esperado para movimentos: {expected_movements}")
+    print(f"Tamanho do vetor: (n={n})")
+    print(f"Comparações: {comparisons}")
+    print(f"Movimentos: {movements}")
+    print(f"Tempo: {(end - start) / 1e9:.6f}s")
+
+    return SortResult(comparisons, movements, end - start)
+
+
+merge_sort_bottom_up_fast = lean(merge_sort_bottom_up)
 
 
 def plotMergeSort():
+    import matplotlib.pyplot as plt
+
     sizes = [10, 50, 100, 150, 200, 300, 500, 800, 1000]
     comps, movs = [], []
     for n in sizes:
         arr = [random.randint(0, 1000) for _ in range(n)]
-        c, m = merge_sort(arr)
+        c, m, _ = merge_sort(arr)
         comps.append(c);
         movs.append(m)
 
@@ -104,4 +219,4 @@ def plotMergeSort():
 if __name__ == "__main__":
     print("Gerando gráficos para Merge Sort...")
     plotMergeSort()
-    print("Gráficos de Merge Sort gerados.")
\ No newline at end of file
+    print("Gráficos de Merge Sort gerados.")
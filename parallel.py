@@ -0,0 +1,271 @@
+import io
+import os
+import time
+import random
+import argparse
+import contextlib
+import multiprocessing
+from multiprocessing import shared_memory
+from array import array as typedArray
+
+from result import SortResult
+from lean import lean
+from merge import merge_sort_bottom_up, merge_sort_bottom_up_fast
+
+
+# merge sort e sample sort em vários núcleos: o vetor vai para um bloco de memória compartilhada e cada processo do pool
+# trabalha num trecho dele, sem pickle dos dados; só índices e contagens passam pelo pool
+
+ITEM_SIZE = typedArray('q').itemsize
+OVERSAMPLING = 32 # amostras por processo na escolha dos separadores
+
+
+@contextlib.contextmanager
+def sharedCopy(values, n): # bloco compartilhado com os valores (ou vazio, para o destino); sempre liberado na saída
+    shm = shared_memory.SharedMemory(create=True, size=max(n * ITEM_SIZE, 1))
+    try:
+        if values is not None:
+            with shm.buf[:n * ITEM_SIZE].cast('q') as view:
+                view[:] = typedArray('q', values)
+        yield shm
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+@contextlib.contextmanager
+def attached(name, n): # abre o bloco compartilhado no processo do pool
+    shm = shared_memory.SharedMemory(name=name)
+    view = shm.buf[:n * ITEM_SIZE].cast('q')
+    try:
+        yield view
+    finally:
+        view.release()
+        shm.close()
+
+
+def addCounts(total, counts): # soma (comparações, movimentos); None (variante lean) continua None
+    return tuple(None if a is None or b is None else a + b for a, b in zip(total, counts))
+
+
+def mergeTwo(left, right): # junta duas listas ordenadas; empate fica com a esquerda (estável)
+    comparisons = 0
+    movements = 0
+    out = []
+    i = j = 0
+    while i < len(left) and j < len(right):
+        comparisons += 1
+        if left[i] <= right[j]:
+            out.append(left[i])
+            i += 1
+        else:
+            out.append(right[j])
+            j += 1
+        movements += 1
+    out.extend(left[i:])
+    out.extend(right[j:])
+    movements += len(left) - i + len(right) - j
+    return out, comparisons, movements
+
+
+mergeTwo_fast = lean(mergeTwo)
+
+
+def findBucket(splitters, x): # busca binária do balde de x: primeiro separador maior que x
+    comparisons = 0
+    lo, hi = 0, len(splitters)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        comparisons += 1
+        if x < splitters[mid]:
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo, comparisons
+
+
+findBucket_fast = lean(findBucket)
+
+
+def sortSlice(name, n, lo, hi, leanSort): # tarefa do pool: ordena view[lo:hi] no lugar
+    with attached(name, n) as view:
+        chunk = view[lo:hi].tolist()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = (merge_sort_bottom_up_fast if leanSort else merge_sort_bottom_up)(chunk)
+        view[lo:hi] = typedArray('q', chunk)
+    return result.comparisons, result.movements
+
+
+def mergeSegments(srcName, dstName, n, segments, offset, leanSort): # junta trechos ordenados de src em dst[offset:]
+    merge = mergeTwo_fast if leanSort else mergeTwo
+    counts = (0, 0)
+    with attached(srcName, n) as src:
+        runs = [src[lo:hi].tolist() for lo, hi in segments if hi > lo]
+    while len(runs) > 1: # em árvore: cada elemento passa por log2(k) merges
+        merged = []
+        for k in range(0, len(runs) - 1, 2):
+            out, c, m = merge(runs[k], runs[k + 1])
+            counts = addCounts(counts, (c, m))
+            merged.append(out)
+        if len(runs) % 2:
+            merged.append(runs[-1])
+        runs = merged
+    if runs:
+        with attached(dstName, n) as dst:
+            dst[offset:offset + len(runs[0])] = typedArray('q', runs[0])
+    return counts
+
+
+def partitionSlice(name, n, lo, hi, splitters, leanSort): # agrupa view[lo:hi] por balde, no lugar; devolve o tamanho de cada balde
+    find = findBucket_fast if leanSort else findBucket
+    buckets = [[] for _ in range(len(splitters) + 1)]
+    comparisons = 0
+    with attached(name, n) as view:
+        for x in view[lo:hi].tolist():
+            b, c = find(splitters, x)
+            buckets[b].append(x)
+            comparisons = None if c is None else comparisons + c
+        view[lo:hi] = typedArray('q', [x for bucket in buckets for x in bucket])
+    return [len(bucket) for bucket in buckets], (comparisons, None if leanSort else hi - lo)
+
+
+def sortBucket(srcName, dstName, n, segments, offset, leanSort): # junta os pedaços de um balde, ordena e grava em dst[offset:]
+    with attached(srcName, n) as src:
+        bucket = [x for lo, hi in segments for x in src[lo:hi].tolist()]
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = (merge_sort_bottom_up_fast if leanSort else merge_sort_bottom_up)(bucket)
+    with attached(dstName, n) as dst:
+        dst[offset:offset + len(bucket)] = typedArray('q', bucket)
+    return result.comparisons, result.movements
+
+
+def slices(n, workers): # limites de `workers` trechos contíguos de tamanhos quase iguais
+    return [(n * w // workers, n * (w + 1) // workers) for w in range(workers)]
+
+
+def bisectLeft(view, x, lo, hi): # bisect_left num trecho da memoryview
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if view[mid] < x:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def parallel_merge_sort(arr, workers=None, leanSort=False):
+    n = len(arr)
+    workers = max(1, min(workers or os.cpu_count() or 1, max(n, 1)))
+    counts = (0, 0) if not leanSort else (None, None)
+    start = time.perf_counter_ns()
+
+    with sharedCopy(arr, n) as src, sharedCopy(None, n) as dst:
+        with multiprocessing.Pool(workers) as pool:
+            # 1) cada processo ordena o seu trecho
+            ranges = slices(n, workers)
+            for c in pool.starmap(sortSlice, [(src.name, n, lo, hi, leanSort) for lo, hi in ranges]):
+                counts = addCounts(counts, c)
+
+            # 2) o merge final também é dividido: separadores tirados dos runs ordenados cortam cada run com uma busca
+            # binária, e a parte j de todos os runs vai para o processo j, que escreve direto na sua posição da saída
+            with attached(src.name, n) as view:
+                sample = sorted(view[lo + (hi - lo) * s // OVERSAMPLING] for lo, hi in ranges if hi > lo for s in range(OVERSAMPLING))
+                splitters = [sample[len(sample) * j // workers] for j in range(1, workers)]
+                cuts = [[lo] + [bisectLeft(view, s, lo, hi) for s in splitters] + [hi] for lo, hi in ranges]
+            tasks = []
+            offset = 0
+            for j in range(workers):
+                segments = [(cut[j], cut[j + 1]) for cut in cuts]
+                tasks.append((src.name, dst.name, n, segments, offset, leanSort))
+                offset += sum(hi - lo for lo, hi in segments)
+            for c in pool.starmap(mergeSegments, tasks):
+                counts = addCounts(counts, c)
+
+        with dst.buf[:n * ITEM_SIZE].cast('q') as view:
+            arr[:] = view.tolist()
+
+    end = time.perf_counter_ns()
+
+    comparisons, movements = counts
+    print(f"== PARALLEL MERGE SORT (workers={workers}) ==")
+    print(f"Tamanho do vetor: (n={n})")
+    print(f"Comparações: {comparisons}")
+    print(f"Movimentos: {movements}")
+    print(f"Tempo: {(end - start) / 1e9:.6f}s")
+
+    return SortResult(comparisons, movements, end - start)
+
+
+def sample_sort(arr, workers=None, leanSort=False, seed=0):
+    n = len(arr)
+    workers = max(1, min(workers or os.cpu_count() or 1, max(n, 1)))
+    counts = (0, 0) if not leanSort else (None, None)
+    start = time.perf_counter_ns()
+
+    # separadores de uma amostra ordenada: com OVERSAMPLING amostras por balde, os baldes saem com tamanhos parecidos
+    rng = random.Random(seed)
+    sample = sorted(rng.choice(arr) for _ in range(OVERSAMPLING * workers)) if n else []
+    splitters = [sample[len(sample) * j // workers] for j in range(1, workers)] if n else []
+
+    with sharedCopy(arr, n) as src, sharedCopy(None, n) as dst:
+        with multiprocessing.Pool(workers) as pool:
+            # 1) cada processo separa o seu trecho por balde, no lugar
+            ranges = slices(n, workers)
+            sizes = []
+            for bucketSizes, c in pool.starmap(partitionSlice, [(src.name, n, lo, hi, splitters, leanSort) for lo, hi in ranges]):
+                sizes.append(bucketSizes)
+                counts = addCounts(counts, c)
+
+            # 2) o balde j junta os pedaços j de todos os trechos, é ordenado por um processo e vai para a sua posição final
+            tasks = []
+            offset = 0
+            for j in range(len(splitters) + 1):
+                segments = [(lo + sum(sizes[w][:j]), lo + sum(sizes[w][:j + 1])) for w, (lo, hi) in enumerate(ranges)]
+                tasks.append((src.name, dst.name, n, segments, offset, leanSort))
+                offset += sum(size[j] for size in sizes)
+            for c in pool.starmap(sortBucket, tasks):
+                counts = addCounts(counts, c)
+
+        with dst.buf[:n * ITEM_SIZE].cast('q') as view:
+            arr[:] = view.tolist()
+
+    end = time.perf_counter_ns()
+
+    comparisons, movements = counts
+    print(f"== SAMPLE SORT (workers={workers}, baldes={len(splitters) + 1}) ==")
+    print(f"Tamanho do vetor: (n={n})")
+    print(f"Comparações: {comparisons}")
+    print(f"Movimentos: {movements}")
+    print(f"Tempo: {(end - start) / 1e9:.6f}s")
+
+    return SortResult(comparisons, movements, end - start)
+
+
+def scalingReport(sizes=(1000000,), workerCounts=(1, 2, 4, 8, 16), typeArray='OrdA', trials=1):
+    # speedup = tempo serial / tempo paralelo; eficiência = speedup / processos. Todos sem contadores
+    from generators import generate
+
+    print("+---------------+----------+---------+----------+--------------+---------+------------+")
+    print("|     Method    |   Size   | Workers |  Cores   |   Time (s)   | Speedup | Efficiency |")
+    print("+---------------+----------+---------+----------+--------------+---------+------------+")
+    for size in sizes:
+        data = generate(typeArray, size, 0).tolist()
+        serial = min(merge_sort_bottom_up_fast(list(data)).sort_ns for _ in range(trials)) / 1e9
+        print("| {:13} | {:8} | {:>7} | {:>8} | {:12.4f} | {:>7} | {:>10} |".format("MergeBU", size, 1, os.cpu_count(), serial, "1.00x", "100%"))
+        for method, sort in (("ParallelMerge", parallel_merge_sort), ("SampleSort", sample_sort)):
+            for workers in workerCounts:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    elapsed = min(sort(list(data), workers, leanSort=True).sort_ns for _ in range(trials)) / 1e9
+                print("| {:13} | {:8} | {:>7} | {:>8} | {:12.4f} | {:>6.2f}x | {:>10.0%} |".format(
+                    method, size, workers, os.cpu_count(), elapsed, serial / elapsed, serial / elapsed / workers))
+    print("+---------------+----------+---------+----------+--------------+---------+------------+")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Speedup e eficiência do merge sort paralelo e do sample sort")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000000])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8, 16])
+    parser.add_argument('--type', default='OrdA')
+    parser.add_argument('--trials', type=int, default=1)
+    args = parser.parse_args()
+    scalingReport(args.sizes, args.workers, args.type, args.trials)
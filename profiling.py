@@ -0,0 +1,108 @@
+import io
+import os
+import time
+import shutil
+import signal
+import pstats
+import cProfile
+import subprocess
+
+
+# perfil opcional de cada job, para explicar a distância entre as contagens do algoritmo e o tempo real: o processo
+# filho roda uma passada extra do método (a mesma variante cronometrada, numa cópia do vetor, fora do tempo medido) com
+#   'cprofile': cProfile; grava <job>.prof (abre com pstats ou snakeviz) e <job>.txt com as funções mais caras
+#   'perf': `perf stat` do Linux preso ao próprio processo; grava <job>.perf.csv com instruções, ciclos, cache misses e
+#           branch misses (contadores de hardware); sem perf, ou sem permissão (perf_event_paranoid), cai no cProfile
+# os arquivos ficam em <output>_profiles/, ao lado do output.txt
+
+PROFILE_MODES = ('off', 'cprofile', 'perf')
+PERF_EVENTS = ('instructions', 'cycles', 'cache-references', 'cache-misses', 'branches', 'branch-misses')
+PERF_ATTACH_SECONDS = 0.2 # o perf leva um instante para se prender ao processo; antes disso nada é contado
+TOP_FUNCTIONS = 30
+
+
+def profileDir(output): # output.txt -> output_profiles/
+    return os.path.splitext(output)[0] + '_profiles'
+
+
+def artifactBase(directory, job): # um arquivo por (método, tamanho, tipo) e repetição
+    name = f"{job['method']}_{job['size']}_{job['vector_type']}_t{job.get('trial', 0)}"
+    return os.path.join(directory, name.replace(':', '-').replace(os.sep, '-'))
+
+
+perfChecked = None
+
+
+def perfAvailable(): # perf instalado e com permissão para contar eventos de hardware; testado uma vez por processo
+    global perfChecked
+    if perfChecked is None:
+        perfChecked = False
+        if shutil.which('perf'):
+            try:
+                check = subprocess.run(['perf', 'stat', '-x', ',', '-e', 'instructions', 'true'],
+                                       capture_output=True, text=True, timeout=10)
+                perfChecked = check.returncode == 0 and '<not supported>' not in check.stderr
+            except (OSError, subprocess.SubprocessError):
+                pass
+    return perfChecked
+
+
+def readPerf(path): # CSV do perf stat -x, : valor,unidade,evento,...; contadores sem suporte ficam None
+    counters = {event: None for event in PERF_EVENTS}
+    with open(path) as f:
+        for line in f:
+            fields = line.strip().split(',')
+            if len(fields) < 3 or line.startswith('#'):
+                continue
+            event = fields[2].split(':')[0] # 'cycles:u' quando o perf só conta o espaço do usuário
+            if event in counters:
+                try:
+                    counters[event] = int(float(fields[0]))
+                except ValueError: # <not counted> / <not supported>
+                    pass
+    return counters
+
+
+def profileCProfile(sort, values, base):
+    profiler = cProfile.Profile()
+    profiler.enable()
+    sort(values)
+    profiler.disable()
+    profiler.dump_stats(base + '.prof')
+    text = io.StringIO()
+    stats = pstats.Stats(profiler, stream=text)
+    stats.sort_stats('cumulative').print_stats(TOP_FUNCTIONS)
+    with open(base + '.txt', 'w') as f:
+        f.write(text.getvalue())
+    return {'tool': 'cprofile', 'calls': stats.total_calls, 'artifact': base + '.prof'}
+
+
+def profilePerf(sort, values, base):
+    path = base + '.perf.csv'
+    perf = subprocess.Popen(['perf', 'stat', '-x', ',', '-e', ','.join(PERF_EVENTS), '-p', str(os.getpid()), '-o', path],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    time.sleep(PERF_ATTACH_SECONDS)
+    sort(values)
+    perf.send_signal(signal.SIGINT) # o perf escreve os totais ao receber o SIGINT
+    perf.wait()
+    return {'tool': 'perf', **readPerf(path), 'artifact': path}
+
+
+def profileSort(mode, base, sort, values): # passada extra de `sort` em `values` com a ferramenta pedida; grava em base.*
+    os.makedirs(os.path.dirname(base), exist_ok=True)
+    if mode == 'perf':
+        if perfAvailable():
+            return profilePerf(sort, values, base)
+        print("[PERFIL] perf indisponível (não instalado ou sem permissão em perf_event_paranoid); usando cProfile")
+    return profileCProfile(sort, values, base)
+
+
+def perElement(profile, n): # métricas por elemento e IPC a partir do que a ferramenta mediu
+    if profile is None or not n:
+        return {}
+    metrics = {'tool': profile['tool'], 'artifact': profile['artifact']}
+    for key, name in (('instructions', 'instructions_per_element'), ('cache-misses', 'cache_misses_per_element'),
+                      ('branch-misses', 'branch_misses_per_element'), ('calls', 'calls_per_element')):
+        metrics[name] = profile[key] / n if profile.get(key) is not None else None
+    metrics['ipc'] = profile['instructions'] / profile['cycles'] if profile.get('instructions') and profile.get('cycles') else None
+    return metrics
@@ -0,0 +1,81 @@
+import sys
+import time
+import threading
+import multiprocessing
+
+
+# progresso dos jobs em andamento: uma thread no processo filho amostra de tempos em tempos os contadores locais do
+# ordenador (pelo quadro da pilha da thread principal) e escreve num vetor compartilhado que o processo pai lê; o laço
+# interno do ordenador não muda em nada, então não há custo nele além da troca de GIL a cada amostra
+
+PROGRESS_FIELDS = ('comparisons', 'movements', 'elapsed', 'fraction')
+UNKNOWN = -1.0 # campo ainda não medido (ou a variante lean, que não tem contadores)
+SAMPLE_INTERVAL = 0.5
+
+
+def newProgress(): # criado pelo pai e passado ao filho; sem lock, uma leitura misturando duas amostras não faz mal
+    return multiprocessing.Array('d', [UNKNOWN] * len(PROGRESS_FIELDS), lock=False)
+
+
+def sorterCounters(frame): # (comparações, movimentos) do quadro mais externo da pilha que tem os contadores
+    counts = None
+    while frame is not None:
+        code = frame.f_code
+        if 'comparisons' in code.co_varnames or 'comparisons' in code.co_cellvars:
+            values = frame.f_locals
+            comparisons, movements = values.get('comparisons'), values.get('movements')
+            if isinstance(comparisons, int) and isinstance(movements, int):
+                counts = (comparisons, movements)
+        frame = frame.f_back
+    return counts
+
+
+def startReporter(progress, expectedOps=None, interval=SAMPLE_INTERVAL): # roda no filho, antes de ordenar
+    target = threading.main_thread().ident
+    started = time.perf_counter()
+
+    def report():
+        while True:
+            time.sleep(interval)
+            counts = sorterCounters(sys._current_frames().get(target))
+            progress[2] = time.perf_counter() - started
+            if counts is not None:
+                progress[0], progress[1] = counts
+                if expectedOps: # fração pelo modelo de custo do método; o modelo é de caso médio, então fica limitada a 1
+                    progress[3] = min(sum(counts) / expectedOps, 1.0)
+
+    threading.Thread(target=report, daemon=True).start()
+
+
+def readProgress(progress): # dicionário com os campos medidos; os desconhecidos ficam None
+    partial = {key: (value if value != UNKNOWN else None) for key, value in zip(PROGRESS_FIELDS, progress[:])}
+    for key in ('comparisons', 'movements'): # contagens vêm como double do vetor compartilhado
+        if partial[key] is not None:
+            partial[key] = int(partial[key])
+    return partial
+
+
+def throughput(partial): # operações contadas (comparações + movimentos) por segundo
+    if partial is None or partial['comparisons'] is None or not partial['elapsed']:
+        return None
+    return (partial['comparisons'] + partial['movements']) / partial['elapsed']
+
+
+def formatProgress(partial):
+    parts = []
+    if partial['fraction'] is not None:
+        parts.append(f"{partial['fraction']:.0%}")
+    if partial['comparisons'] is not None:
+        parts.append(f"{partial['comparisons']:.0f} comparações")
+        parts.append(f"{partial['movements']:.0f} movimentos")
+        parts.append(f"{throughput(partial) / 1e6:.2f}M op/s")
+    parts.append(f"{partial['elapsed'] or 0:.1f}s")
+    return " | ".join(parts)
+
+
+def formatTimeout(partial): # resumo curto para a coluna de tempo: as contagens já têm colunas próprias
+    parts = [f"{partial['fraction']:.0%} em {partial['elapsed'] or 0:.1f}s" if partial['fraction'] is not None else
+             f"{partial['elapsed'] or 0:.1f}s"]
+    if throughput(partial) is not None:
+        parts.append(f"{throughput(partial) / 1e6:.2f}M op/s")
+    return ", ".join(parts)
@@ -0,0 +1,232 @@
+import io
+import math
+import time
+import argparse
+import itertools
+import contextlib
+
+from result import SortResult
+from lean import lean
+from insertion import insertion_range, insertion_range_fast
+
+
+# ordenação sem comparações para vetores de inteiros (tudo que o generators produz): as chaves são distribuídas por
+# dígitos de `width` bits em baldes, então o custo é O(n * dígitos) em vez de O(n log n). Os contadores são passadas
+# pelos baldes e movimentos (escritas); comparações só aparecem no corte para a inserção do American flag.
+# chaves negativas funcionam: tudo é feito sobre x - min(arr)
+
+COUNTING_MAX_RANGE = 2 ** 24 # acima disso o vetor de contagem (8 bytes por chave possível) não compensa: use o radix
+FLAG_CUTOFF = 32 # baldes até esse tamanho vão para a inserção no American flag
+
+
+def radixDigits(n, width): # dígitos de `width` bits de uma chave no intervalo do OrdA (0 a 10n)
+    return max(-(-(10 * n).bit_length() // width), 1)
+
+
+def lsdRadixCosts(n, width=8): # cada dígito: uma passada espalhando nos baldes e outra juntando
+    return 0, 2 * n * radixDigits(n, width)
+
+
+def countingCosts(n): # uma passada contando e n escritas
+    return 0, n
+
+
+def americanFlagCosts(n, width=8, cutoff=FLAG_CUTOFF): # níveis de baldes até o corte, mais a inserção nos baldes pequenos
+    levels = min(math.ceil(math.log(n / cutoff, 2 ** width)), radixDigits(n, width)) if n > cutoff else 0
+    inserts = round(n * (min(n, cutoff) - 1) / 4) # pior caso da inserção: baldes do tamanho do corte
+    return inserts, n * levels + inserts + 2 * n
+
+
+def lsd_radix(arr, width=8):
+    n = len(arr)
+    comparisons = 0
+    movements = 0
+    passes = 0
+    start = time.perf_counter_ns()
+
+    if n:
+        lo = min(arr)
+        span = max(arr) - lo
+        mask = (1 << width) - 1
+        shift = 0
+        # do dígito menos significativo para o mais significativo; cada passada é estável, então a ordem dos
+        # dígitos já vistos se mantém dentro de cada balde
+        while span >> shift:
+            buckets = [[] for _ in range(mask + 1)]
+            appends = [bucket.append for bucket in buckets]
+            for x in arr:
+                appends[(x - lo) >> shift & mask](x)
+            movements += n
+            arr[:] = itertools.chain.from_iterable(buckets)
+            movements += n
+            passes += 1
+            shift += width
+
+    end = time.perf_counter_ns()
+
+    expected_compares, expected_movements = lsdRadixCosts(n, width)
+
+    print(f"== LSD RADIX SORT (dígito de {width} bits) ==")
+    print(f"Cálculo esperado para movimentos: {expected_movements}")
+    print(f"Tamanho do vetor: (n={n})")
+    print(f"Passadas: {passes}")
+    print(f"Comparações: {comparisons}")
+    print(f"Movimentos: {movements}")
+    print(f"Tempo: {(end - start) / 1e9:.6f}s")
+
+    return SortResult(comparisons, movements, end - start)
+
+
+lsd_radix_fast = lean(lsd_radix) # mesma implementação, sem contadores e sem prints
+
+
+def counting_sort(arr, maxRange=COUNTING_MAX_RANGE):
+    n = len(arr)
+    comparisons = 0
+    movements = 0
+    passes = 0
+    start = time.perf_counter_ns()
+
+    if n:
+        lo = min(arr)
+        keys = max(arr) - lo + 1
+        if keys > maxRange:
+            raise ValueError(f"Intervalo de chaves grande demais para o counting sort: {keys} > {maxRange}")
+        counts = [0] * keys
+        for x in arr:
+            counts[x - lo] += 1
+        passes += 1
+        # o vetor é reescrito direto das contagens: com inteiros, chaves iguais são indistinguíveis
+        i = 0
+        for key, count in enumerate(counts):
+            if count:
+                arr[i:i + count] = itertools.repeat(key + lo, count)
+                movements += count
+                i += count
+        passes += 1
+
+    end = time.perf_counter_ns()
+
+    expected_compares, expected_movements = countingCosts(n)
+
+    print(f"== COUNTING SORT ==")
+    print(f"Cálculo esperado para movimentos: {expected_movements}")
+    print(f"Tamanho do vetor: (n={n})")
+    print(f"Passadas: {passes}")
+    print(f"Comparações: {comparisons}")
+    print(f"Movimentos: {movements}")
+    print(f"Tempo: {(end - start) / 1e9:.6f}s")
+
+    return SortResult(comparisons, movements, end - start)
+
+
+counting_sort_fast = lean(counting_sort)
+
+
+def american_flag(arr, width=8, cutoff=FLAG_CUTOFF):
+    n = len(arr)
+    comparisons = 0
+    movements = 0
+    passes = 0
+    start = time.perf_counter_ns()
+
+    radix = 1 << width
+    mask = radix - 1
+    lo = min(arr) if n else 0
+    span = max(arr) - lo if n else 0
+    # MSD no lugar: do dígito mais significativo para baixo, cada trecho é permutado nos seus baldes por ciclos de
+    # trocas (sem vetor auxiliar) e cada balde vira um trecho do próximo dígito; a pilha evita recursão
+    stack = [(0, n, max(span.bit_length() - width, 0))] if span else []
+    while stack:
+        first, last, shift = stack.pop()
+        if last - first <= cutoff:
+            c, m = insertion_range(arr, first, last)
+            comparisons += c
+            movements += m
+            continue
+
+        counts = [0] * radix
+        for i in range(first, last):
+            counts[(arr[i] - lo) >> shift & mask] += 1
+        starts = list(itertools.accumulate(counts, initial=first))
+        heads = starts[:-1]
+        passes += 1
+
+        for b in range(radix): # cada elemento fora do lugar vai para a cabeça do seu balde, trazendo o que estava lá
+            bucketEnd = starts[b + 1]
+            while heads[b] < bucketEnd:
+                x = arr[heads[b]]
+                d = (x - lo) >> shift & mask
+                while d != b:
+                    h = heads[d]
+                    arr[h], x = x, arr[h]
+                    heads[d] = h + 1
+                    movements += 1
+                    d = (x - lo) >> shift & mask
+                arr[heads[b]] = x
+                heads[b] += 1
+                movements += 1
+
+        if shift: # o último dígito pode se sobrepor ao anterior, o que não faz mal: dentro do balde esses bits são iguais
+            nextShift = max(shift - width, 0)
+            for b in range(radix):
+                if starts[b + 1] - starts[b] > 1:
+                    stack.append((starts[b], starts[b + 1], nextShift))
+
+    end = time.perf_counter_ns()
+
+    expected_compares, expected_movements = americanFlagCosts(n, width, cutoff)
+
+    print(f"== AMERICAN FLAG SORT (dígito de {width} bits, corte={cutoff}) ==")
+    print(f"Cálculo esperado para comparações: {expected_compares}")
+    print(f"Cálculo esperado para movimentos: {expected_movements}")
+    print(f"Tamanho do vetor: (n={n})")
+    print(f"Passadas: {passes}")
+    print(f"Comparações: {comparisons}")
+    print(f"Movimentos: {movements}")
+    print(f"Tempo: {(end - start) / 1e9:.6f}s")
+
+    return SortResult(comparisons, movements, end - start)
+
+
+american_flag_fast = lean(american_flag)
+
+
+def crossoverReport(sizes=(10 ** 4, 10 ** 5, 10 ** 6), types=('OrdA', 'FewUnique'), trials=1):
+    # radix contra os melhores métodos por comparação, todos sem contadores; 10^7 e 10^8 cabem com --sizes, mas
+    # uma lista de int gasta ~36 bytes por elemento (10^8 pede uns 4GB só para o vetor)
+    from generators import generate
+    from merge import merge_sort_bottom_up_fast
+    from hybrid import timsort_fast
+
+    methods = (("MergeBU", merge_sort_bottom_up_fast), ("Tim", timsort_fast), ("Radix", lsd_radix_fast),
+               ("Radix16", lambda arr: lsd_radix_fast(arr, 16)), ("AmericanFlag", american_flag_fast),
+               ("Counting", counting_sort_fast))
+
+    print("+--------------+-----------+-----------+--------------+------------+")
+    print("|    Method    |    Size   |    Type   |   Time (s)   | vs MergeBU |")
+    print("+--------------+-----------+-----------+--------------+------------+")
+    for size in sizes:
+        for typeArray in types:
+            data = generate(typeArray, size, 0).tolist()
+            baseline = None
+            for method, sort in methods:
+                try:
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        elapsed = min(sort(list(data)).sort_ns for _ in range(trials)) / 1e9
+                except ValueError: # counting sort com intervalo de chaves grande demais
+                    print("| {:12} | {:9} | {:9} | {:>12} | {:>10} |".format(method, size, typeArray, "-", "-"))
+                    continue
+                baseline = baseline or elapsed
+                print("| {:12} | {:9} | {:9} | {:12.4f} | {:>9.2f}x |".format(
+                    method, size, typeArray, elapsed, baseline / elapsed))
+    print("+--------------+-----------+-----------+--------------+------------+")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Radix, counting e American flag contra merge e Timsort")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10 ** 4, 10 ** 5, 10 ** 6])
+    parser.add_argument('--types', nargs='+', default=['OrdA', 'FewUnique'])
+    parser.add_argument('--trials', type=int, default=1)
+    args = parser.parse_args()
+    crossoverReport(args.sizes, args.types, args.trials)
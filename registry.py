@@ -0,0 +1,144 @@
+import functools
+import dataclasses
+import importlib.metadata
+from typing import Callable, Optional
+
+from insertion import insertion, insertion_fast, insertionCosts
+from selection import selection, selection_fast, selectionCosts
+from shell import shell, shell_fast, shellCosts
+from bubble import bubble, bubble_fast, bubbleCosts
+from merge import merge_sort, merge_sort_fast, merge_sort_bottom_up, merge_sort_bottom_up_fast, mergeCosts
+from heap import heap, heap_fast, heap_floyd, heap_floyd_fast, heapCosts, heapFloydCosts
+from hybrid import merge_insertion, merge_insertion_fast, timsort, timsort_fast, cachedCutoff, mergeInsertionCosts, timsortCosts
+from external import external_sort_list
+from parallel import parallel_merge_sort, sample_sort
+from radix import lsd_radix, lsd_radix_fast, counting_sort, counting_sort_fast, american_flag, american_flag_fast, lsdRadixCosts, countingCosts, americanFlagCosts
+
+
+# registro dos métodos de ordenação: o nome usado no input.txt aponta para o método e para o que se sabe dele (modelo
+# de custo, estabilidade, memória extra, maior n prático). Métodos de fora do projeto entram pelo grupo de entry points
+# 'sortmethods.algorithms' de qualquer pacote instalado, que aponta para um Algorithm ou uma lista deles, ex.:
+#   [project.entry-points."sortmethods.algorithms"]
+#   radixC = "meupacote.sorts:ALGORITHMS"
+# um plugin com o mesmo nome de um método embutido o substitui (para trocar por uma implementação otimizada)
+
+ENTRY_POINT_GROUP = 'sortmethods.algorithms'
+KINDS = ('list', 'int', 'numpy')
+EXTERNAL_MEMORY = 8 * 2 ** 20 # orçamento do método External: ~130 mil elementos por run
+
+
+@dataclasses.dataclass(frozen=True)
+class Algorithm:
+    name: str
+    sort: Callable # ordena a lista no lugar, imprime o relatório e devolve SortResult
+    fast: Optional[Callable] = None # variante lean, sem contadores e sem prints; None: só existe a instrumentada
+    costs: Optional[Callable] = None # n -> (comparações, movimentos) esperados; None: a admissão não estima o tempo
+    stable: bool = False # mantém a ordem de elementos iguais (sem key=)
+    inPlace: bool = True # memória extra O(1) ou O(log n) além do vetor
+    maxSize: Optional[int] = None # maior n que termina num tempo razoável; acima disso a linha do input gera um aviso
+    kind: str = 'list' # 'list': elementos comparáveis; 'int': só inteiros (sem elementos embrulhados); 'numpy': np.ndarray
+
+    def function(self, lean=False): # a variante lean cai na instrumentada quando o método não tem uma
+        return (self.fast or self.sort) if lean else self.sort
+
+    def cost(self, n): # comparações + movimentos esperados, ou None sem modelo
+        return sum(self.costs(n)) if self.costs is not None else None
+
+
+ALGORITHMS = {}
+pluginsLoaded = False
+
+
+def register(algorithm, replace=False):
+    if not isinstance(algorithm, Algorithm):
+        raise TypeError(f"Esperado um Algorithm, recebido {type(algorithm).__name__}")
+    if algorithm.kind not in KINDS:
+        raise ValueError(f"Tipo de entrada desconhecido em {algorithm.name}: {algorithm.kind}")
+    if algorithm.name in ALGORITHMS and not replace:
+        raise ValueError(f"Método já registrado: {algorithm.name}")
+    ALGORITHMS[algorithm.name] = algorithm
+    return algorithm
+
+
+def loadPlugins(): # uma vez por processo; um plugin quebrado gera um aviso e não derruba a execução
+    global pluginsLoaded
+    if pluginsLoaded:
+        return
+    pluginsLoaded = True
+    for entryPoint in importlib.metadata.entry_points(group=ENTRY_POINT_GROUP):
+        try:
+            loaded = entryPoint.load()
+            for algorithm in (loaded if isinstance(loaded, (list, tuple)) else [loaded]):
+                if algorithm.name in ALGORITHMS:
+                    print(f"[PLUGIN] {entryPoint.value}: {algorithm.name} substitui o método embutido")
+                register(algorithm, replace=True)
+        except Exception as e:
+            print(f"[PLUGIN] {entryPoint.name} ({entryPoint.value}) ignorado: {e}")
+
+
+def algorithms(): # todos os métodos, na ordem de registro (os plugins no final)
+    loadPlugins()
+    return dict(ALGORITHMS)
+
+
+def algorithm(name):
+    loadPlugins()
+    if name not in ALGORITHMS:
+        raise ValueError(f"Método desconhecido: {name}")
+    return ALGORITHMS[name]
+
+
+def numpyMethod(name): # backend NumPy, importado só quando usado; a contagem é vetorizada, não existe variante lean
+    def sort(arr):
+        import vectorized
+        return getattr(vectorized, name)(arr)
+    sort.__name__ = name
+    return sort
+
+
+QUADRATIC_MAX = 200000 # O(n^2) em Python: ~10^10 operações já passam das 2h do timeout padrão
+
+for builtin in (
+    Algorithm("Insert", insertion, insertion_fast, insertionCosts, stable=True, maxSize=QUADRATIC_MAX),
+    Algorithm("Shell", shell, shell_fast, functools.partial(shellCosts, 'knuth')),
+    # shell com outras sequências de gaps
+    Algorithm("ShellSedgewick", functools.partial(shell, gaps='sedgewick'), functools.partial(shell_fast, gaps='sedgewick'),
+              functools.partial(shellCosts, 'sedgewick')),
+    Algorithm("ShellTokuda", functools.partial(shell, gaps='tokuda'), functools.partial(shell_fast, gaps='tokuda'),
+              functools.partial(shellCosts, 'tokuda')),
+    Algorithm("ShellCiura", functools.partial(shell, gaps='ciura'), functools.partial(shell_fast, gaps='ciura'),
+              functools.partial(shellCosts, 'ciura')),
+    Algorithm("ShellPratt", functools.partial(shell, gaps='pratt'), functools.partial(shell_fast, gaps='pratt'),
+              functools.partial(shellCosts, 'pratt')),
+    Algorithm("Select", selection, selection_fast, selectionCosts, maxSize=QUADRATIC_MAX // 2),
+    Algorithm("Bubble", bubble, bubble_fast, bubbleCosts, stable=True, maxSize=QUADRATIC_MAX // 4),
+    Algorithm("Merge", merge_sort, merge_sort_fast, mergeCosts, stable=True, inPlace=False),
+    Algorithm("MergeBU", merge_sort_bottom_up, merge_sort_bottom_up_fast, mergeCosts, stable=True, inPlace=False),
+    # merge que entrega os pedaços pequenos para a inserção; o corte é medido uma vez por máquina
+    Algorithm("MergeInsertion", merge_insertion, merge_insertion_fast, lambda n: mergeInsertionCosts(n, cachedCutoff()),
+              stable=True, inPlace=False),
+    Algorithm("Tim", timsort, timsort_fast, timsortCosts, stable=True, inPlace=False), # merge de runs naturais no estilo Timsort
+    Algorithm("Heap", heap, heap_fast, heapCosts),
+    Algorithm("HeapFloyd", heap_floyd, heap_floyd_fast, heapFloydCosts),
+    # heap 4-ária: metade da altura, melhor uso de cache
+    Algorithm("HeapFloyd4", functools.partial(heap_floyd, d=4), functools.partial(heap_floyd_fast, d=4),
+              functools.partial(heapFloydCosts, d=4)),
+    # merge sort externo com orçamento pequeno, para passar por vários runs em disco; os runs são gravados como int64
+    Algorithm("External", functools.partial(external_sort_list, memory_bytes=EXTERNAL_MEMORY), costs=mergeCosts,
+              stable=True, inPlace=False, kind='int'),
+    # trechos ordenados em paralelo sobre memória compartilhada (blocos int64) e merge também dividido
+    Algorithm("ParallelMerge", parallel_merge_sort, functools.partial(parallel_merge_sort, leanSort=True), mergeCosts,
+              stable=True, inPlace=False, kind='int'),
+    Algorithm("SampleSort", sample_sort, functools.partial(sample_sort, leanSort=True), mergeCosts, stable=True, inPlace=False,
+              kind='int'),
+    # sem comparações: só ordenam inteiros
+    *(Algorithm(name, functools.partial(lsd_radix, width=width), functools.partial(lsd_radix_fast, width=width),
+                functools.partial(lsdRadixCosts, width=width), stable=True, inPlace=False, kind='int')
+      for name, width in (("Radix", 8), ("Radix4", 4), ("Radix11", 11), ("Radix16", 16))),
+    Algorithm("Counting", counting_sort, counting_sort_fast, countingCosts, inPlace=False, kind='int'),
+    Algorithm("AmericanFlag", american_flag, american_flag_fast, americanFlagCosts, kind='int'), # MSD radix no lugar
+    Algorithm("ShellNP", numpyMethod('shell_np'), kind='numpy'),
+    Algorithm("MergeNP", numpyMethod('merge_np'), stable=True, inPlace=False, kind='numpy'),
+    Algorithm("HeapNP", numpyMethod('heap_np'), kind='numpy'),
+):
+    register(builtin)
@@ -0,0 +1,6 @@
+from collections import namedtuple
+
+
+# resultado devolvido por todos os métodos de ordenação
+# sort_ns é só o tempo da ordenação em nanossegundos (time.perf_counter_ns), sem criação de processo nem IPC
+SortResult = namedtuple('SortResult', ['comparisons', 'movements', 'sort_ns'])
@@ -1,14 +1,22 @@
-import matplotlib.pyplot as plt
 import random
 import time
 
+from result import SortResult
+from lean import lean
+from keyed import keyed
 
+
+def selectionCosts(n):
+    return (n * (n - 1)) / 2, 3 * (n - 1)
+
+
+@keyed
 def selection(arr):
     n = len(arr)
     comparisons = 0
     movements = 0
 
-    start = time.time()
+    start = time.perf_counter_ns()
 
     for i in range(n - 1):
         min = i  
@@ -20,33 +28,33 @@ def selection(arr):
             arr[i], arr[min] = arr[min], arr[i]  
             movements += 3  
 
-    end = time.time()
+    end = time.perf_counter_ns()
 
-    expected_compares = (n * (n - 1)) / 2
-    expected_movements = 3 * (n - 1)
+    expected_compares, expected_movements = selectionCosts(n)
 
     print("\n== SELECTION SORT ==")
     print(f"Cálculo esperado para comparações: {expected_compares}")
     print(f"Cálculo esperado para movimentos: {expected_movements}")
     print(f"Comparações: {comparisons}")
     print(f"Movimentos: {movements}")
-    print(f"Tempo de execução: {end - start:.6f} segundos")
+    print(f"Tempo de execução: {(end - start) / 1e9:.6f} segundos")
 
-    return comparisons, movements
+    return SortResult(comparisons, movements, end - start)
 
 
-arr1 = [3, 2, 1, 5, 4]
-selection(arr1.copy())
+selection_fast = keyed(lean(selection)) # mesma implementação, sem contadores e sem prints
 
 
 def plotSelection():
+    import matplotlib.pyplot as plt
+
     sizes = [10, 20, 30, 40, 50, 60, 70, 80, 90, 100, 150, 200, 300, 500, 800, 1000]
     comparisonsList = []
     movementsList = []
 
     for size in sizes:
         arr_random = [random.randint(0, 20) for _ in range(size)]
-        qtdeComparisons, qtdeMovements = selection(list(arr_random))
+        qtdeComparisons, qtdeMovements, _ = selection(list(arr_random))
 
         comparisonsList.append(qtdeComparisons)
         movementsList.append(qtdeMovements)
@@ -76,6 +84,10 @@ def plotSelection():
     plt.show()
 
 
-print("Gerando gráficos para Selection Sort...")
-plotSelection()
-print("Gráficos de Selection Sort gerados.")
+if __name__ == "__main__":
+    arr1 = [3, 2, 1, 5, 4]
+    selection(arr1.copy())
+
+    print("Gerando gráficos para Selection Sort...")
+    plotSelection()
+    print("Gráficos de Selection Sort gerados.")
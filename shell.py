@@ -1,21 +1,97 @@
-import matplotlib.pyplot as plt
 import random
 import time
-
-
-def shell(arr):
+import io
+import sys
+import math
+import functools
+import contextlib
+
+from result import SortResult
+from lean import lean
+from keyed import keyed
+
+
+def knuthGaps(n): # h = 3*h + 1 enquanto h < n/3 (a sequência original deste shell)
+    gaps = [1]
+    while gaps[-1] < n // 3:
+        gaps.append(gaps[-1] * 3 + 1)
+    return gaps
+
+
+def sedgewickGaps(n): # Sedgewick 1986: 4^k + 3*2^(k-1) + 1, precedido do 1
+    gaps = [1]
+    k = 1
+    while 4 ** k + 3 * 2 ** (k - 1) + 1 < n:
+        gaps.append(4 ** k + 3 * 2 ** (k - 1) + 1)
+        k += 1
+    return gaps
+
+
+def tokudaGaps(n): # Tokuda 1992: ceil((9^k - 4^k) / (5 * 4^(k-1)))
+    gaps = [1]
+    k = 2
+    while -(-(9 ** k - 4 ** k) // (5 * 4 ** (k - 1))) < n:
+        gaps.append(-(-(9 ** k - 4 ** k) // (5 * 4 ** (k - 1))))
+        k += 1
+    return gaps
+
+
+def ciuraGaps(n): # Ciura 2001 (medida até 701), estendida multiplicando por 2.25
+    gaps = [1, 4, 10, 23, 57, 132, 301, 701]
+    while int(gaps[-1] * 2.25) < n:
+        gaps.append(int(gaps[-1] * 2.25))
+    return [h for h in gaps if h == 1 or h < n]
+
+
+def prattGaps(n): # Pratt 1971: todos os 2^p * 3^q menores que n
+    gaps = []
+    power2 = 1
+    while power2 < max(n, 2):
+        h = power2
+        while h < max(n, 2):
+            gaps.append(h)
+            h *= 3
+        power2 *= 2
+    return sorted(gaps)
+
+
+GAP_SEQUENCES = {
+    'knuth': knuthGaps,
+    'sedgewick': sedgewickGaps,
+    'tokuda': tokudaGaps,
+    'ciura': ciuraGaps,
+    'pratt': prattGaps,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def gapSequence(gaps, n): # gaps do maior para o menor, calculados uma vez por (sequência, n)
+    if gaps not in GAP_SEQUENCES:
+        raise ValueError(f"Sequência de gaps desconhecida: {gaps}")
+    return tuple(reversed(GAP_SEQUENCES[gaps](n)))
+
+
+def shellCosts(gaps, n): # aproximações assintóticas de comparações e movimentos para cada sequência
+    if n <= 1:
+        return 0, 0
+    if gaps == 'knuth':
+        return n * (n ** 0.25), n * (n ** 0.5)
+    if gaps == 'sedgewick':
+        return n ** (4 / 3), n ** (4 / 3)
+    if gaps == 'pratt':
+        return n * math.log2(n) ** 2, n * math.log2(n) ** 2
+    return n * (n ** 0.25), n * (n ** 0.25)  # tokuda e ciura: empíricas, próximas de n^1.25
+
+
+@keyed
+def shell(arr, gaps='knuth'):
     n = len(arr)
-    h = 1
     comparisons = 0
     movements = 0
 
-    start = time.time()
+    start = time.perf_counter_ns()
 
-    # Knuth sequencia h = 3*h + 1
-    while h < n // 3:
-        h = h * 3 + 1
-
-    while h >= 1: # laço externo que executa enquanto o gap for válido
+    for h in gapSequence(gaps, n): # laço externo que percorre os gaps do maior para o menor
         for i in range(h, n):
             aux = arr[i]
             movements += 1
@@ -33,30 +109,27 @@ def shell(arr):
             arr[j] = aux
             movements += 1
 
-        h = h // 3
-
-    end = time.time()
+    end = time.perf_counter_ns()
 
-    timeTotal = end - start
-    expected_compares = n * (n ** 0.25)  # Knuth sequencia
-    expected_movements = n * (n ** 0.5)
+    timeTotal = (end - start) / 1e9
+    expected_compares, expected_movements = shellCosts(gaps, n)
 
-    print("\n== SHELL SORT ==")
+    print(f"\n== SHELL SORT ({gaps}) ==")
     print(f"Cálculo esperado para comparações: {expected_compares:.2f}")
     print(f"Cálculo esperado para movimentos: {expected_movements:.2f}")
     print(f"Comparações: {comparisons}")
     print(f"Movimentos: {movements}")
     print(f"Tempo de execução: {timeTotal:.6f} segundos")
 
-    return comparisons, movements
+    return SortResult(comparisons, movements, end - start)
 
 
-arr1 = [3, 2, 1, 5, 4]
-print("Array original:", arr1)
-shell(arr1.copy())
+shell_fast = keyed(lean(shell)) # mesma implementação, sem contadores e sem prints
 
 
 def plotShell():
+    import matplotlib.pyplot as plt
+
     sizes = [10, 20, 30, 40, 50, 60, 70, 80, 90, 100, 150, 200, 300, 500, 800, 1000]
     comparisonsList = []
     movementsList = []
@@ -64,7 +137,7 @@ def plotShell():
     for size in sizes:
         print(f"Processing size: {size}")
         arr_random = [random.randint(0, 1000) for _ in range(size)]
-        qtdeComparisons, qtdeMovements = shell(list(arr_random))
+        qtdeComparisons, qtdeMovements, _ = shell(list(arr_random))
 
         comparisonsList.append(qtdeComparisons)
         movementsList.append(qtdeMovements)
@@ -94,6 +167,32 @@ def plotShell():
     plt.show()
 
 
-print("\nGerando gráficos para Shell Sort...")
-plotShell()
-print("Gráficos de Shell Sort gerados.")
\ No newline at end of file
+def sweepGaps(sizes=(1000, 10000, 100000), types=('OrdA', 'OrdC', 'OrdD')): # compara as sequências de gaps nos mesmos vetores
+    from sortMethods import arrayType
+
+    print("+-----------+---------+-------------+-------------+-------------+--------------+")
+    print("|    Gaps   |   Size  | Vector Type | Comparisons |  Movements  |   Time (s)   |")
+    print("+-----------+---------+-------------+-------------+-------------+--------------+")
+    for size in sizes:
+        for vtype in types:
+            array = arrayType(size, vtype, seed=0)
+            for gaps in GAP_SEQUENCES:
+                with contextlib.redirect_stdout(io.StringIO()): # só a tabela, sem o relatório de cada execução
+                    counted = shell(list(array), gaps)
+                timed = shell_fast(list(array), gaps) # tempo medido sem o custo dos contadores
+                print("| {:9} | {:7} | {:11} | {:>11} | {:>11} | {:>12.6f} |".format(
+                    gaps, size, vtype, counted.comparisons, counted.movements, timed.sort_ns / 1e9))
+    print("+-----------+---------+-------------+-------------+-------------+--------------+")
+
+
+if __name__ == "__main__":
+    if '--sweep' in sys.argv: # python shell.py --sweep compara as sequências de gaps
+        sweepGaps()
+    else:
+        arr1 = [3, 2, 1, 5, 4]
+        print("Array original:", arr1)
+        shell(arr1.copy())
+
+        print("\nGerando gráficos para Shell Sort...")
+        plotShell()
+        print("Gráficos de Shell Sort gerados.")
@@ -0,0 +1,146 @@
+import os
+import csv
+import json
+import socket
+import platform
+import datetime
+import multiprocessing
+
+from progress import throughput
+
+
+# saídas legíveis por máquina do resultado: cada linha leva junto o ambiente onde foi medida, para juntar execuções
+# de várias máquinas num dataframe sem reler a tabela de texto
+
+STAT_KEYS = ('n', 'min', 'median', 'mean', 'stdev', 'ci95')
+
+
+def cpuModel(): # nome do processador; /proc/cpuinfo no Linux, sysctl no macOS, platform nos outros
+    try:
+        with open('/proc/cpuinfo') as f:
+            for line in f:
+                if line.startswith('model name') or line.startswith('Hardware'):
+                    return line.split(':', 1)[1].strip()
+    except OSError:
+        pass
+    if platform.system() == 'Darwin':
+        try:
+            import subprocess
+            return subprocess.run(['sysctl', '-n', 'machdep.cpu.brand_string'], capture_output=True, text=True).stdout.strip()
+        except OSError:
+            pass
+    return platform.processor() or platform.machine()
+
+
+def memoryBytes(): # RAM total, quando o sistema informa
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def environmentInfo(): # detectado na hora, no lugar da configuração do PC escrita à mão
+    return {
+        'host': socket.gethostname(),
+        'os': f"{platform.system()} {platform.release()}",
+        'cpu': cpuModel(),
+        'cores': os.cpu_count(),
+        'memory_bytes': memoryBytes(),
+        'python': f"{platform.python_implementation()} {platform.python_version()}",
+        'start_method': multiprocessing.get_start_method(),
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+    }
+
+
+def printEnvironment(env):
+    print("################ CONFIGS DO PC ################")
+    print(f"Host: {env['host']}")
+    print(f"SO: {env['os']}")
+    print(f"CPU: {env['cpu']} ({env['cores']} núcleos)")
+    if env['memory_bytes']:
+        print(f"RAM: {env['memory_bytes'] / 2 ** 30:.1f}GB")
+    print(f"Python: {env['python']} (start method: {env['start_method']})")
+    print("################################################")
+
+
+def flatRow(result, env): # uma linha plana: contagens vazias viram None e a estatística vira colunas stat_*
+    timeStats = result['stats'] or {}
+    partial = result['partial'] or {} # progresso até o timeout
+    profile = result['profile'] or {} # métricas do --profile
+    row = {
+        'method': result['method'],
+        'size': result['size'],
+        'vector_type': result['vector_type'],
+        'status': 'ok' if result['time'] is not None else 'predicted_timeout' if result['predicted_time'] is not None else 'timeout',
+        'time': result['time'],
+        'predicted_time': result['predicted_time'],
+        'setup_time': result['setup_time'],
+        'ipc_time': result['ipc_time'],
+        'comparisons': result['comparisons'] if result['comparisons'] != '' else None,
+        'movements': result['movements'] if result['movements'] != '' else None,
+        'trials': result['trials'],
+        'peak_rss_bytes': result['peak_rss'],
+        'rss_growth_bytes': result['rss_growth'],
+        'alloc_peak_bytes': result['alloc_peak'],
+        'bytes_per_element': result['bytes_per_element'],
+        'profile_tool': profile.get('tool'),
+        'instructions_per_element': profile.get('instructions_per_element'),
+        'cache_misses_per_element': profile.get('cache_misses_per_element'),
+        'branch_misses_per_element': profile.get('branch_misses_per_element'),
+        'ipc': profile.get('ipc'),
+        'calls_per_element': profile.get('calls_per_element'),
+        'profile_artifact': profile.get('artifact'),
+        'partial_comparisons': partial.get('comparisons'),
+        'partial_movements': partial.get('movements'),
+        'partial_elapsed': partial.get('elapsed'),
+        'partial_fraction': partial.get('fraction'),
+        'partial_throughput': throughput(result['partial']),
+    }
+    row.update({f"stat_{key}": timeStats.get(key) for key in STAT_KEYS})
+    row.update({f"env_{key}": value for key, value in env.items()})
+    return row
+
+
+def writeCsv(results, filename, env):
+    rows = [flatRow(result, env) for result in results]
+    with open(filename, 'w', newline='') as f:
+        if rows:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+def writeJson(results, filename, env): # o ambiente vai uma vez no topo e as linhas ficam sem as colunas env_*
+    with open(filename, 'w') as f:
+        json.dump({'environment': env, 'results': [flatRow(result, {}) for result in results]}, f, indent=2)
+        f.write("\n")
+
+
+def writeParquet(results, filename, env):
+    import pyarrow
+    import pyarrow.parquet
+
+    table = pyarrow.Table.from_pylist([flatRow(result, env) for result in results])
+    pyarrow.parquet.write_table(table.replace_schema_metadata({'environment': json.dumps(env)}), filename)
+
+
+SINKS = {
+    'csv': writeCsv,
+    'json': writeJson,
+    'parquet': writeParquet,
+}
+
+
+def writeSinks(results, formats, basename, env): # grava <basename>.<formato> para cada formato pedido
+    written = []
+    for fmt in formats:
+        if fmt not in SINKS:
+            raise ValueError(f"Formato desconhecido: {fmt}")
+        filename = f"{basename}.{fmt}"
+        try:
+            SINKS[fmt](results, filename, env)
+        except ImportError as e: # parquet só com o pyarrow instalado
+            print(f"Formato {fmt} ignorado: {e}")
+            continue
+        written.append(filename)
+    return written
@@ -1,15 +1,28 @@
+import os
+import sys
+import json
+import operator
 import time
-import random
-import matplotlib.pyplot as plt
-import numpy as np
+import argparse
+import functools
+import statistics
 import multiprocessing
+import multiprocessing.connection
+from multiprocessing import shared_memory
+from array import array as typedArray
 
 
-from insertion import insertion
-from selection import selection
-from shell import shell
-from merge import merge_sort
-from heap import heap
+from hybrid import cachedCutoff
+from registry import algorithm, algorithms
+from admission import CALIBRATION_SIZES, calibrate, extrapolate
+from result import SortResult
+from stats import summarize
+from counting import countOps
+from memory import MEMORY_MODES, startRss, finishRss, allocationPeak, bytesPerElement
+from profiling import PROFILE_MODES, profileDir, artifactBase, profileSort, perElement, perfAvailable
+from progress import newProgress, startReporter, readProgress, formatProgress, formatTimeout
+from generators import dataset, generate, parseType
+from sinks import SINKS, environmentInfo, printEnvironment, writeSinks
 
 
 
@@ -19,76 +32,439 @@ def readInput(filename): # lê o arquivo input
     return [line.strip().split(',') for line in lines if line.strip()]
 
 
-def arrayType(size, typeArray): # verifica no input qual tipo de array é
-    if typeArray == "OrdC":
-        return list(range(size))
-    elif typeArray == "OrdD":
-        return list(range(size, 0, -1))
-    elif typeArray == "OrdA":
-        return random.sample(range(size * 10), size)
-    else:
-        raise ValueError(f"Tipo de vetor desconhecido: {typeArray}")
+def arrayType(size, typeArray, seed=None): # verifica no input qual tipo de array é; os tipos ficam no registro do generators
+    return generate(typeArray, size, seed).tolist()
 
 
-def callSortMethod(method, array, timeout_seconds=7200): # chama os métodos importados com base no nome do método
-    def run_sort(queue, method, array):
-        try:
-            if method == "Insert":
-                result = insertion(array)
-            elif method == "Shell":
-                result = shell(array)
-            elif method == "Select":
-                result = selection(array)
-            elif method == "Merge":
-                result = merge_sort(array)
-            elif method == "Heap":
-                result = heap(array)
-            else:
-                raise ValueError(f"Método desconhecido: {method}")
-            queue.put(result)
-        except Exception as e:
-            queue.put((None, None))
-            print(f"[ERRO] {method}: {e}")
+def toSharedMemory(values): # copia o vetor para um bloco de memória compartilhada com inteiros de 64 bits
+    buffer = values if isinstance(values, memoryview) else typedArray('q', values) # memoryview de int64 (cache) vai direto
+    shm = shared_memory.SharedMemory(create=True, size=max(len(buffer) * buffer.itemsize, 1))
+    view = sharedView(shm, len(buffer))
+    view[:] = buffer
+    view.release()
+    return shm
+
+
+def sharedView(shm, size): # enxerga o bloco compartilhado como vetor de inteiros (o SO pode arredondar o tamanho do bloco)
+    return shm.buf[:size * typedArray('q').itemsize].cast('q')
+
 
-    queue = multiprocessing.Queue() # divide numa fila de processos, caso algum passe de 2h rodando, escreve o resultado e pula para o próximo
-    process = multiprocessing.Process(target=run_sort, args=(queue, method, array))
-    process.start()
-    process.join(timeout_seconds)
+def isSorted(values):
+    return all(map(operator.le, values, values[1:]))
 
-    if process.is_alive(): # mata o processo, antes gerava erro de freezing do código
-        process.terminate()
-        process.join()
-        print(f"[TIMEOUT] Método {method} com vetor de tamanho {len(array)} excedeu {timeout_seconds} segundos.")
-        return None, None
 
-    if not queue.empty():
-        return queue.get()
-    else:
-        return None, None
+def sortFunction(method, lean=False): # devolve a função de ordenação com base no nome do método (lean = variante sem contadores)
+    return algorithm(method).function(lean)
 
 
+def costModel(method): # (comparações, movimentos) esperados em função de n; None quando o método não tem modelo
+    return algorithm(method).costs
+
+
+def predictRuntime(method, typeArray, size, warmup=0, counts='inline', calibrations=None, memory='rss'): # segundos estimados do job no filho
+    kind = algorithm(method).kind
+    cost = costModel(method)
+    if cost is None or size <= CALIBRATION_SIZES[-1]:
+        return None
+    calibrations = {} if calibrations is None else calibrations
+    # o filho roda warmup + 1 ordenações da variante cronometrada e, fora do inline e do off, mais uma passada de contagem
+    variants = ['inline' if counts == 'inline' else 'lean'] * (warmup + 1)
+    if counts == 'separate' or (counts in ('exact', 'sampled') and kind == 'int'):
+        variants.append('inline')
+    elif counts in ('exact', 'sampled') and kind == 'list':
+        variants.append(counts)
+    if memory == 'tracemalloc': # passada extra da lean; com o tracemalloc ela é mais lenta, então a estimativa fica por baixo
+        variants.append('lean')
+    total = 0
+    for variant in variants:
+        key = (method, typeArray, variant)
+        if key not in calibrations: # uma calibração por método, tipo e variante, reaproveitada entre as linhas
+            if variant in ('exact', 'sampled'):
+                sort = functools.partial(countOps, sortFunction(method, lean=True), mode=variant)
+            else:
+                sort = sortFunction(method, lean=variant == 'lean')
+            try:
+                calibrations[key] = calibrate(sort, typeArray)
+            except Exception as e: # sem estimativa o job roda mesmo assim; um erro de verdade aparece no processo filho
+                print(f"[AVISO] Calibração de {method} ({variant}) falhou: {e}")
+                calibrations[key] = None
+        if calibrations[key] is None:
+            return None
+        total += extrapolate(calibrations[key], cost, size)
+    return total
+
+
+def runSort(queue, method, shmName, size, warmup=0, counts='inline', progress=None, memory='rss', profile=None): # executa o método escolhido no processo filho
+    # counts: 'inline' mede o tempo da própria versão instrumentada; 'separate' mede a versão lean e conta numa
+    # segunda passada sobre uma cópia do mesmo vetor; 'exact'/'sampled' fazem essa passada com a camada do counting.py
+    # (elementos embrulhados) em vez dos contadores do método; 'off' só roda a versão lean
+    # memory: 'rss' mede o pico de RSS da ordenação cronometrada; 'tracemalloc' também o pico alocado, numa passada à parte
+    # profile: (modo, arquivo base) para uma passada à parte com cProfile ou perf stat; None não perfila
+    shm = shared_memory.SharedMemory(name=shmName)
+    view = sharedView(shm, size)
+    try:
+        entry = algorithm(method)
+        if progress is not None: # contadores parciais para o pai, lidos da pilha por uma thread à parte
+            startReporter(progress, entry.cost(size))
+        sort = entry.function(lean=counts != 'inline')
+        # o vetor vem da memória compartilhada sem pickle; ordena uma lista (acesso mais rápido que a memoryview
+        # no laço interno) ou um np.ndarray no backend NumPy, e devolve o resultado ao mesmo bloco,
+        # onde o processo pai confere a ordenação
+        if entry.kind == 'numpy':
+            import numpy as np
+            load = lambda: np.frombuffer(view, dtype=np.int64).copy()
+        else:
+            load = view.tolist
+        array = load()
+        # perf_counter_ns usa o relógio monotônico do sistema, então dá para comparar com os instantes do processo pai
+        started = time.perf_counter_ns()
+        for _ in range(warmup): # aquecimento descartado: cópias do mesmo vetor, o bloco compartilhado fica intacto
+            sort(load())
+        before = startRss() if memory != 'off' else None
+        result = sort(array)
+        usage = finishRss(before) if before is not None else None
+        if counts == 'separate' or (counts in ('exact', 'sampled') and entry.kind == 'int'): # radix não compara nada que dê para embrulhar
+            counted = entry.function()(load())
+            result = result._replace(comparisons=counted.comparisons, movements=counted.movements)
+        elif counts in ('exact', 'sampled') and entry.kind == 'list': # NumPy fica com a contagem vetorizada própria
+            counted = countOps(entry.function(lean=True), load(), counts)
+            result = result._replace(comparisons=counted.comparisons, movements=counted.movements)
+        if memory == 'tracemalloc':
+            usage['alloc_peak'] = allocationPeak(entry.function(lean=True), load())
+        profiled = profileSort(*profile, sort, load()) if profile is not None else None
+        finished = time.perf_counter_ns()
+        if entry.kind == 'numpy':
+            with view.cast('B') as raw:
+                raw[:] = array.tobytes()
+        else:
+            view[:] = typedArray('q', array)
+        queue.put((result, started, finished, usage, profiled))
+    except Exception as e:
+        queue.put((None, None, None, None, None))
+        print(f"[ERRO] {method}: {e}")
+    finally:
+        view.release()
+        shm.close()
+
+
+def callSortMethod(method, array, timeout_seconds=7200, profile='off', output='output.txt'): # chama os métodos importados com base no nome do método, ordena `array` no lugar
+    # profile 'cprofile'/'perf': grava o perfil de uma passada extra em <output>_profiles/<método>_<n>_array_t0.*
+    shm = toSharedMemory(array)
+    try:
+        queue = multiprocessing.Queue() # divide numa fila de processos, caso algum passe de 2h rodando, escreve o resultado e pula para o próximo
+        progress = newProgress()
+        artifact = (profile, artifactBase(profileDir(output), {'method': method, 'size': len(array), 'vector_type': 'array'})) \
+            if profile != 'off' else None
+        process = multiprocessing.Process(target=runSort, args=(queue, method, shm.name, len(array), 0, 'inline', progress, 'rss', artifact))
+        process.start()
+        process.join(timeout_seconds)
+
+        if process.is_alive(): # mata o processo, antes gerava erro de freezing do código
+            process.terminate()
+            process.join()
+            partial = readProgress(progress)
+            print(f"[TIMEOUT] Método {method} com vetor de tamanho {len(array)} excedeu {timeout_seconds} segundos "
+                  f"({formatProgress(partial)}).")
+            # sem tempo (sort_ns None), mas com as contagens feitas até o timeout
+            return SortResult(None if partial['comparisons'] is None else int(partial['comparisons']),
+                              None if partial['movements'] is None else int(partial['movements']), None)
+
+        result = queue.get()[0] if not queue.empty() else None
+        if result is None:
+            return SortResult(None, None, None)
+        view = sharedView(shm, len(array))
+        array[:] = view.tolist()
+        view.release()
+        return result
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def jobCost(method, size): # estimativa grosseira do custo do job, usada para começar pelos mais longos
+    cost = algorithm(method).cost(size) # operações esperadas pelo modelo do método; sem modelo, n log n
+    return cost if cost is not None else size * max(size.bit_length(), 1)
+
+
+def makeResult(config, samples, predicted=None, partial=None): # junta as repetições de uma configuração numa linha; sem amostras (timeout) gera informações nulas
+    if not samples:
+        return {
+            'method': config['method'],
+            'size': config['size'],
+            'vector_type': config['vector_type'],
+            'predicted_time': predicted, # estimativa da admissão quando o job nem foi lançado
+            'partial': partial, # progresso até o timeout: contagens parciais, tempo e fração feita
+            'time': None,
+            'setup_time': None,
+            'ipc_time': None,
+            'comparisons': '',
+            'movements': '',
+            'trials': 0,
+            'stats': None,
+            'peak_rss': None,
+            'rss_growth': None,
+            'alloc_peak': None,
+            'bytes_per_element': None,
+            'profile': None
+        }
+    timeStats = summarize([result.sort_ns / 1e9 for result, *_ in samples])
+    comparisons = [result.comparisons for result, *_ in samples]
+    movements = [result.movements for result, *_ in samples]
+    usage = {key: medianMemory(samples, key) for key in ('peak_rss', 'rss_growth', 'alloc_peak')}
+    return {
+        'method': config['method'],
+        'size': config['size'],
+        'vector_type': config['vector_type'],
+        'predicted_time': None,
+        'partial': None,
+        'time': timeStats['median'],
+        'setup_time': statistics.median(setupTime for _, setupTime, *_ in samples),
+        'ipc_time': statistics.median(ipcTime for _, _, ipcTime, *_ in samples),
+        'comparisons': statistics.median_low(comparisons) if None not in comparisons else '', # sem contagem (--counts off)
+        'movements': statistics.median_low(movements) if None not in movements else '',
+        'trials': len(samples),
+        'stats': timeStats,
+        **usage,
+        'bytes_per_element': bytesPerElement(usage, config['size']),
+        'profile': profileMetrics(samples, config['size'])
+    }
+
+
+def medianMemory(samples, key): # mediana das repetições; None se alguma não mediu (--memory off, diário antigo)
+    values = [usage[key] if usage is not None else None for _, _, _, usage, _ in samples]
+    return statistics.median_low(values) if None not in values else None
+
+
+def profileMetrics(samples, n): # métricas por elemento das repetições perfiladas (mediana); o artefato é o da primeira
+    metrics = [perElement(profiled, n) for *_, profiled in samples if profiled is not None]
+    if not metrics:
+        return None
+    merged = dict(metrics[0])
+    for key in merged:
+        if key not in ('tool', 'artifact'):
+            values = [m[key] for m in metrics if m.get(key) is not None]
+            merged[key] = statistics.median(values) if values else None
+    return merged
+
+
+def journalKey(config): # identifica uma linha do input no diário
+    return (config['method'], config['size'], config['vector_type'])
+
+
+def appendJournal(journal, job, status, sample=None, partial=None): # grava um resultado assim que ele sai, para sobreviver a queda, Ctrl-C ou timeout
+    result, setupTime, ipcTime, usage, profiled = sample if sample is not None else (None, None, None, None, None)
+    record = {
+        'method': job['method'],
+        'size': job['size'],
+        'vector_type': job['vector_type'],
+        'status': status,
+        'seed': job.get('seed'),
+        'sort_ns': result.sort_ns if result is not None else None,
+        'setup_time': setupTime,
+        'ipc_time': ipcTime,
+        'comparisons': result.comparisons if result is not None else None,
+        'movements': result.movements if result is not None else None,
+        'partial': partial,
+        'memory': usage,
+        'profile': profiled
+    }
+    journal.write(json.dumps(record) + "\n")
+    journal.flush()
+    os.fsync(journal.fileno())
+
+
+def readJournal(filename): # registros já gravados, agrupados por linha do input
+    done = {}
+    try:
+        with open(filename) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError: # última linha cortada por uma queda no meio da escrita
+                    continue
+                done.setdefault(journalKey(record), []).append(record)
+    except FileNotFoundError:
+        pass
+    return done
+
+
+def journalSample(record): # volta o registro do diário para o formato (SortResult, setup, ipc, memória, perfil)
+    return (SortResult(record['comparisons'], record['movements'], record['sort_ns']), record['setup_time'], record['ipc_time'],
+            record.get('memory'), record.get('profile'))
+
+
+def runJobs(jobs, workers=None, timeout_seconds=7200, warmup=0, counts='inline', journal=None, progress_seconds=10, memory='rss',
+            profile='off', profiles=None): # roda os jobs em paralelo, no máximo `workers` processos ao mesmo tempo
+    # cada job é uma repetição; 'config' identifica a linha do input à qual ela pertence
+    # a cada progress_seconds mostra o andamento dos jobs ainda rodando (0 desliga)
+    # com profile 'cprofile'/'perf', cada job grava o seu perfil no diretório `profiles`
+    workers = max(1, workers or os.cpu_count() or 1)
+    # os jobs mais longos (Insert/Select em vetores grandes) entram primeiro para não sobrarem no final sozinhos
+    pending = sorted(range(len(jobs)), key=lambda k: jobCost(jobs[k]['method'], jobs[k]['size']), reverse=True)
+    running = {}
+    samples = [None] * len(jobs) # (SortResult, setup, ipc, memória, perfil) de cada job; None em caso de timeout ou erro
+    partials = {} # progresso no momento do timeout, por job
+    nextReport = time.time() + progress_seconds
+
+    try:
+        while pending or running:
+            while pending and len(running) < workers:
+                k = pending.pop(0)
+                job = jobs[k]
+                print("============================================================================")
+                print(f"Executando {job['method']} com tamanho={job['size']} tipo={job['vector_type']}")
+                # cada repetição recebe um vetor novo; a mesma repetição de métodos diferentes recebe o mesmo vetor (mesma semente)
+                with dataset(job['vector_type'], job['size'], job.get('seed')) as values:
+                    shm = toSharedMemory(values)
+                queue = multiprocessing.Queue()
+                progress = newProgress()
+                artifact = (profile, artifactBase(profiles, job)) if profile != 'off' else None
+                process = multiprocessing.Process(target=runSort, args=(queue, job['method'], shm.name, job['size'], warmup, counts, progress,
+                                                                        memory, artifact))
+                start = time.time()
+                launched = time.perf_counter_ns()
+                process.start()
+                running[process.sentinel] = (k, process, queue, start, launched, shm, progress)
+
+            # espera algum processo terminar, o prazo mais próximo de timeout vencer ou a hora de mostrar o andamento
+            deadline = min(entry[3] + timeout_seconds for entry in running.values())
+            if progress_seconds:
+                deadline = min(deadline, nextReport)
+            ready = multiprocessing.connection.wait(list(running), timeout=max(0, deadline - time.time()))
+
+            now = time.time()
+            if progress_seconds and now >= nextReport:
+                for k, process, queue, start, launched, shm, progress in running.values():
+                    if process.sentinel not in ready:
+                        print(f"[PROGRESSO] {jobs[k]['method']} tamanho={jobs[k]['size']} tipo={jobs[k]['vector_type']}: "
+                              f"{formatProgress(readProgress(progress))}")
+                nextReport = now + progress_seconds
+            for sentinel in list(running):
+                k, process, queue, start, launched, shm, progress = running[sentinel]
+                job = jobs[k]
+                if sentinel in ready:
+                    result, started, finished, usage, profiled = queue.get() if not queue.empty() else (None, None, None, None, None)
+                    process.join()
+                    received = time.perf_counter_ns()
+                    if result is not None:
+                        # setup = criação do processo + entrega do vetor; ipc = retorno do resultado + join
+                        samples[k] = (result, (started - launched) / 1e9, (received - finished) / 1e9, usage, profiled)
+                        view = sharedView(shm, job['size'])
+                        if not isSorted(view.tolist()):
+                            print(f"[ERRO] Método {job['method']} não ordenou o vetor de tamanho {job['size']} tipo={job['vector_type']}")
+                        view.release()
+                    if journal is not None:
+                        appendJournal(journal, job, 'ok' if result is not None else 'error', samples[k])
+                elif now - start >= timeout_seconds: # mata o processo, antes gerava erro de freezing do código
+                    process.terminate()
+                    process.join()
+                    partials[k] = readProgress(progress) # última amostra do filho, no máximo meio segundo antes do fim
+                    print(f"[TIMEOUT] Método {job['method']} com vetor de tamanho {job['size']} excedeu {timeout_seconds} segundos "
+                          f"({formatProgress(partials[k])}).")
+                    if journal is not None:
+                        appendJournal(journal, job, 'timeout', partial=partials[k])
+                    # as outras repetições da mesma configuração também estourariam o limite
+                    pending = [p for p in pending if jobs[p]['config'] != job['config']]
+                else:
+                    continue
+                shm.close()
+                shm.unlink()
+                del running[sentinel]
+    finally: # Ctrl-C ou erro no meio: não deixa processo filho nem memória compartilhada para trás
+        for k, process, queue, start, launched, shm, progress in running.values():
+            process.terminate()
+            process.join()
+            shm.close()
+            shm.unlink()
+
+    return samples, partials
+
+
+def writeTable(f, headers, rows, left=(0, 2)): # largura de cada coluna pelo maior valor, para nenhum número estourar a borda
+    widths = [max([len(header)] + [len(row[k]) for row in rows]) for k, header in enumerate(headers)]
+    border = "+" + "+".join("-" * (width + 2) for width in widths) + "+\n"
+    f.write(border)
+    f.write("|" + "|".join(f" {header:^{width}} " for header, width in zip(headers, widths)) + "|\n")
+    f.write(border)
+    for row in rows:
+        f.write("|" + "|".join(f" {cell:<{width}} " if k in left else f" {cell:>{width}} "
+                               for k, (cell, width) in enumerate(zip(row, widths))) + "|\n")
+    f.write(border)
+
+
+def listAlgorithms(f=sys.stdout): # os métodos registrados (embutidos e plugins) com os metadados de cada um
+    writeTable(f, ["Method", "Kind", "Stable", "In place", "Max n", "Cost model", "Lean"], [[
+        entry.name,
+        entry.kind,
+        "yes" if entry.stable else "no",
+        "yes" if entry.inPlace else "no",
+        str(entry.maxSize) if entry.maxSize is not None else "-",
+        "yes" if entry.costs is not None else "no",
+        "yes" if entry.fast is not None else "no"
+    ] for entry in algorithms().values()], left=(0, 1))
+
+
+def partialCount(result, key): # contagem até o timeout, marcada com '+' (o total seria maior)
+    if result['partial'] is None or result['partial'][key] is None:
+        return 'N/A'
+    return f"{result['partial'][key]:.0f}+"
+
+
+def megabytes(value):
+    return f"{value / 2 ** 20:.1f}" if value is not None else "N/A"
+
 
 def writeOutput(results, filename='output.txt'): # escreve o resultado, caso tenha gerado timeout, informações nulas
     with open(filename, 'w') as f:
-        f.write("+----------------+---------+-------------+----------+-------------+-----------+\n")
-        f.write("|     Method     |   Size  | Vector Type | Time (s) | Comparisons | Movements |\n")
-        f.write("+----------------+---------+-------------+----------+-------------+-----------+\n")
-        for result in results:
-            f.write("| {:14} | {:7} | {:11} | {:>8} | {:>11} | {:>9} |\n".format(
+        writeTable(f, ["Method", "Size", "Vector Type", "Time (s)", "Setup (s)", "IPC (s)", "Comparisons", "Movements",
+                       "Peak RSS (MB)", "Alloc peak (MB)", "Extra B/elt"], [[
+            result['method'],
+            str(result['size']),
+            result['vector_type'],
+            f"{result['time']:.10f}" if result['time'] is not None else
+            f"PREDICTED_TIMEOUT (~{result['predicted_time']:.0f}s)" if result['predicted_time'] is not None else
+            f"TIMEOUT ({formatTimeout(result['partial'])})" if result['partial'] is not None else "TIMEOUT",
+            f"{result['setup_time']:.6f}" if result['setup_time'] is not None else "N/A",
+            f"{result['ipc_time']:.6f}" if result['ipc_time'] is not None else "N/A",
+            str(result['comparisons']) if result['comparisons'] != '' else partialCount(result, 'comparisons'),
+            str(result['movements']) if result['movements'] != '' else partialCount(result, 'movements'),
+            megabytes(result['peak_rss']),
+            megabytes(result['alloc_peak']),
+            f"{result['bytes_per_element']:.1f}" if result['bytes_per_element'] is not None else "N/A",
+        ] for result in results])
+
+        if any(result['trials'] > 1 for result in results): # tabela extra com a estatística das repetições (Time acima é a mediana)
+            f.write("\n")
+            writeTable(f, ["Method", "Size", "Vector Type", "Trials", "Min (s)", "Median (s)", "Mean (s)", "Stdev (s)", "CI95 (+-s)"], [[
+                result['method'],
+                str(result['size']),
+                result['vector_type'],
+                str(result['trials']),
+                *([f"{result['stats'][key]:.8f}" for key in ('min', 'median', 'mean', 'stdev', 'ci95')] if result['stats'] else ["TIMEOUT"] * 5)
+            ] for result in results])
+
+        if any(result['profile'] for result in results): # tabela extra com o perfil (passada à parte, ver profiling.py)
+            f.write("\n")
+            writeTable(f, ["Method", "Size", "Vector Type", "Tool", "Instr/elt", "Cache miss/elt", "Branch miss/elt", "IPC",
+                           "Calls/elt", "Artifact"], [[
                 result['method'],
-                result['size'],
+                str(result['size']),
                 result['vector_type'],
-                f"{result['time']:.10f}" if result['time'] is not None else "TIMEOUT",
-                result['comparisons'] if result['comparisons'] != '' else 'N/A',
-                result['movements'] if result['movements'] != '' else 'N/A'
-            ))
-        f.write("+----------------+---------+-------------+----------+-------------+-----------+\n")
+                *([result['profile']['tool']] + [f"{result['profile'][key]:.2f}" if result['profile'][key] is not None else "N/A"
+                  for key in ('instructions_per_element', 'cache_misses_per_element', 'branch_misses_per_element', 'ipc',
+                              'calls_per_element')] + [os.path.relpath(result['profile']['artifact'])]
+                  if result['profile'] else ["N/A"] * 7)
+            ] for result in results], left=(0, 2, 3, 9))
 
 
 def plotResults(results): # plota os resultados para cada tamanho de vetor
+    # matplotlib e numpy só entram aqui, para não pesar no import do módulo nem na partida de cada processo filho
+    import matplotlib.pyplot as plt
+    import numpy as np
+
     sizes = [100, 1000, 10000, 1000000]
     arrayTypes = ['OrdA', 'OrdC', 'OrdD']
-    methods = ['Insert', 'Shell', 'Select', 'Merge', 'Heap']
+    methods = list(algorithms()) # na ordem do registro; só aparecem os que têm resultado
 
     data = {}
     for size in sizes:
@@ -187,10 +563,11 @@ def plotResults(results): # plota os resultados para cada tamanho de vetor
         plt.show()
 
 
-def main():
-    file = 'input.txt'
+def main(file='input.txt', workers=None, timeout_seconds=7200, trials=1, warmup=0, counts='inline', output='output.txt',
+         resume=False, formats=(), seed=0, admission=True, progress_seconds=10, memory='rss', profile='off'):
+    env = environmentInfo()
     inputs = readInput(file)
-    results = []
+    configs = []
 
     for instruction in inputs:
         if len(instruction) != 3: # input diferente considera inválido
@@ -203,47 +580,109 @@ def main():
         except ValueError:
             print(f"Tamanho inválido: {size}")
             continue
-
-        print("============================================================================")
-        print(f"Executando {method} com tamanho={size} tipo={arrType}")
-        array = arrayType(size, arrType)
-        start = time.time()
-        comparisons, movements = callSortMethod(method, list(array))
-        end = time.time()
-
-        if comparisons is None or movements is None:
-            results.append({
-                'method': method,
-                'size': size,
-                'vector_type': arrType,
-                'time': None,
-                'comparisons': '',
-                'movements': ''
-            })
+        try:
+            parseType(arrType)
+        except ValueError:
+            print(f"Tipo de vetor inválido: {arrType}")
             continue
-
-        totalTime = end - start
-
-        results.append({
-            'method': method,
-            'size': size,
-            'vector_type': arrType,
-            'time': totalTime,
-            'comparisons': comparisons,
-            'movements': movements
-        })
-    writeOutput(results)
+        try:
+            entry = algorithm(method)
+        except ValueError:
+            print(f"Método inválido: {method}")
+            continue
+        if entry.maxSize is not None and size > entry.maxSize: # roda mesmo assim: a admissão e o timeout decidem
+            print(f"[AVISO] {method} com tamanho={size} passa do maior n prático do método ({entry.maxSize})")
+
+        configs.append({'method': method, 'size': size, 'vector_type': arrType})
+
+    if profile == 'perf' and not perfAvailable(): # avisa uma vez aqui, em vez de em cada processo filho
+        print("[PERFIL] perf indisponível (não instalado ou sem permissão em perf_event_paranoid); usando cProfile")
+        profile = 'cprofile'
+
+    if any(config['method'] == "MergeInsertion" for config in configs):
+        cachedCutoff() # mede o corte uma vez aqui, e não em cada processo filho
+
+    # diário JSON Lines ao lado do output; com resume, as repetições já gravadas não rodam de novo
+    journalFile = os.path.splitext(output)[0] + '.jsonl'
+    done = readJournal(journalFile) if resume else {}
+    recorded = []
+    predicted = [None] * len(configs)
+    partials = [None] * len(configs)
+    calibrations = {}
+    jobs = []
+    for c, config in enumerate(configs):
+        records = done.pop(journalKey(config), [])
+        recorded.append([journalSample(record) for record in records if record['status'] == 'ok'])
+        if any(record['status'] == 'timeout' for record in records):
+            partials[c] = next(record.get('partial') for record in records if record['status'] == 'timeout')
+            continue # já estourou o limite antes, rodaria de novo até o timeout
+        if admission and len(recorded[c]) < max(1, trials):
+            estimate = predictRuntime(config['method'], config['vector_type'], config['size'], warmup, counts, calibrations, memory)
+            if estimate is not None and estimate > timeout_seconds: # nem lança: o timeout seria gasto inteiro à toa
+                print(f"[PREDICTED_TIMEOUT] Método {config['method']} com vetor de tamanho {config['size']} tipo={config['vector_type']}: "
+                      f"estimativa ~{estimate:.0f}s excede {timeout_seconds} segundos.")
+                predicted[c] = estimate
+                continue
+        # cada configuração vira `trials` jobs independentes, cada um com seu próprio vetor
+        # repetição t usa a semente seed + t; sem semente (seed=None) cada vetor é aleatório
+        jobs += [dict(config, config=c, trial=t, seed=None if seed is None else seed + t) for t in range(len(recorded[c]), max(1, trials))]
+    if resume:
+        print(f"Retomando {journalFile}: {sum(len(r) for r in recorded)} repetições já gravadas, {len(jobs)} a executar")
+
+    with open(journalFile, 'a' if resume else 'w') as journal:
+        if journal.tell() > 0: # linha cortada por uma queda não pode grudar no próximo registro
+            with open(journalFile, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    journal.write("\n")
+        samples, timedOut = runJobs(jobs, workers, timeout_seconds, warmup, counts, journal, progress_seconds, memory,
+                                     profile, profileDir(output))
+    for k, partial in timedOut.items():
+        partials[jobs[k]['config']] = partial
+    results = [makeResult(config, recorded[c] + [samples[k] for k, job in enumerate(jobs) if job['config'] == c and samples[k] is not None],
+                          predicted[c], partials[c]) for c, config in enumerate(configs)]
+    writeOutput(results, output)
+    for filename in writeSinks(results, formats, os.path.splitext(output)[0], env):
+        print(f"Resultados gravados em {filename}")
 
     print("Gerando gráficos comparativos...")
     plotResults(results)
 
-    print("################ CONFIGS DO PC ################")
-    print("SO: Fedora")
-    print("CPU: Intel Core i5-12450HX")
-    print("RAM: 16GB")
-    print("Python: 3.13")
-    print("################################################")
+    printEnvironment(env)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Compara os métodos de ordenação listados no input.txt")
+    parser.add_argument('--input', default='input.txt')
+    parser.add_argument('--workers', type=int, default=None, help="processos simultâneos (padrão: número de núcleos)")
+    parser.add_argument('--timeout', type=int, default=7200, help="limite em segundos por job")
+    parser.add_argument('--trials', type=int, default=1, help="repetições medidas por linha do input, cada uma com um vetor novo")
+    parser.add_argument('--warmup', type=int, default=0, help="ordenações descartadas antes da medida em cada repetição")
+    parser.add_argument('--counts', choices=['inline', 'separate', 'exact', 'sampled', 'off'], default='inline',
+                        help="inline: cronometra a versão instrumentada; separate: cronometra a versão sem contadores e conta numa "
+                             "segunda passada; exact/sampled: idem, contando na segunda passada com elementos embrulhados "
+                             "(todos, ou 10%% deles estimando só as comparações); off: só a versão sem contadores")
+    parser.add_argument('--output', default='output.txt', help="tabela final; o diário vai para o mesmo nome com .jsonl")
+    parser.add_argument('--resume', action='store_true', help="continua o diário existente, pulando o que já foi gravado")
+    parser.add_argument('--format', action='append', choices=sorted(SINKS), default=[], dest='formats',
+                        help="grava também <output>.csv/.json/.parquet com o ambiente detectado; pode repetir")
+    parser.add_argument('--seed', type=int, default=0, help="semente base dos vetores (a repetição t usa seed + t)")
+    parser.add_argument('--no-seed', action='store_const', const=None, dest='seed', help="vetores aleatórios, sem reprodutibilidade")
+    parser.add_argument('--no-admission', action='store_false', dest='admission',
+                        help="lança todos os jobs, sem estimar antes quais passariam do --timeout")
+    parser.add_argument('--progress', type=float, default=10, dest='progress_seconds',
+                        help="intervalo em segundos do andamento dos jobs em execução (0 desliga)")
+    parser.add_argument('--memory', choices=MEMORY_MODES, default='rss',
+                        help="rss: pico de RSS de cada ordenação (sem custo); tracemalloc: também o pico alocado, numa passada "
+                             "extra fora do tempo medido; off: sem medida de memória")
+    parser.add_argument('--profile', choices=PROFILE_MODES, default='off',
+                        help="perfil de uma passada extra de cada job, fora do tempo medido: cprofile (funções) ou perf "
+                             "(perf stat: instruções, cache e branch misses; sem perf, cai no cprofile); grava em <output>_profiles/")
+    parser.add_argument('--list', action='store_true', help="lista os métodos registrados (inclusive plugins) e sai")
+    args = parser.parse_args()
+    if args.list:
+        listAlgorithms()
+        raise SystemExit
+    main(args.input, args.workers, args.timeout, args.trials, args.warmup, args.counts, output=args.output, resume=args.resume,
+         formats=args.formats, seed=args.seed, admission=args.admission, progress_seconds=args.progress_seconds,
+         memory=args.memory, profile=args.profile)
\ No newline at end of file
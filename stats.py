@@ -0,0 +1,33 @@
+import math
+import statistics
+
+
+# valores críticos da t de Student (bicaudal, 95%) por graus de liberdade
+T_CRITICAL_95 = {
+    1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365, 8: 2.306, 9: 2.262, 10: 2.228,
+    11: 2.201, 12: 2.179, 13: 2.160, 14: 2.145, 15: 2.131, 16: 2.120, 17: 2.110, 18: 2.101, 19: 2.093, 20: 2.086,
+    21: 2.080, 22: 2.074, 23: 2.069, 24: 2.064, 25: 2.060, 26: 2.056, 27: 2.052, 28: 2.048, 29: 2.045, 30: 2.042,
+    40: 2.021, 60: 2.000, 120: 1.980,
+}
+
+
+def tCritical(df): # acima de 30 usa a linha tabelada mais próxima por baixo (mais conservadora), no limite 1.96
+    if df in T_CRITICAL_95:
+        return T_CRITICAL_95[df]
+    if df > 120:
+        return 1.960
+    return T_CRITICAL_95[max(k for k in T_CRITICAL_95 if k < df)]
+
+
+def summarize(samples): # resumo das repetições de uma configuração: mínimo, mediana, média, desvio e IC de 95% da média
+    n = len(samples)
+    mean = statistics.fmean(samples)
+    stdev = statistics.stdev(samples) if n > 1 else 0.0
+    return {
+        'n': n,
+        'min': min(samples),
+        'median': statistics.median(samples),
+        'mean': mean,
+        'stdev': stdev,
+        'ci95': tCritical(n - 1) * stdev / math.sqrt(n) if n > 1 else 0.0,
+    }
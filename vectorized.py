@@ -0,0 +1,167 @@
+import time
+
+import numpy as np
+
+from result import SortResult
+from shell import gapSequence
+
+
+# versões NumPy de shell, merge e heap para vetores grandes: recebem um np.ndarray e ordenam no lugar
+
+
+def shell_np(arr):
+    n = len(arr)
+    comparisons = 0
+    movements = 0
+    start = time.perf_counter_ns()
+
+    # cada passada h deixa as cadeias arr[k], arr[k+h], arr[k+2h]... ordenadas (o mesmo resultado da inserção com gap h),
+    # mas com transposição par-ímpar: os pares (i, i+h) de mesma paridade na cadeia são disjuntos e trocam todos de uma vez
+    for h in gapSequence('knuth', n):
+        positions = np.arange(max(n - h, 0))
+        pairs = [positions[(positions // h) % 2 == parity] for parity in (0, 1)]
+        swapped = True
+        while swapped:
+            swapped = False
+            for idx in pairs:
+                a = arr[idx]
+                b = arr[idx + h]
+                mask = a > b
+                comparisons += len(idx)
+                swaps = int(np.count_nonzero(mask))
+                if swaps:
+                    arr[idx[mask]] = b[mask]
+                    arr[idx[mask] + h] = a[mask]
+                    movements += 3 * swaps
+                    swapped = True
+
+    end = time.perf_counter_ns()
+
+    print("\n== SHELL SORT (NumPy) ==")
+    print(f"Comparações: {comparisons}")
+    print(f"Movimentos: {movements}")
+    print(f"Tempo de execução: {(end - start) / 1e9:.6f} segundos")
+
+    return SortResult(comparisons, movements, end - start)
+
+
+def mergePass(src, dst, width): # junta todos os pares de blocos de tamanho `width` de uma vez
+    n = len(src)
+    pos = np.arange(n)
+    block = pos // (2 * width)
+    inRight = (pos % (2 * width)) >= width
+    leftPos, rightPos = pos[~inRight], pos[inRight]
+    leftBlock, rightBlock = block[~inRight], block[inRight]
+
+    # soma block * span aos valores para que uma única searchsorted não misture blocos diferentes
+    low, high = int(src.min()), int(src.max())
+    span = high - low + 1
+    if span * (int(block[-1]) + 1) < 2 ** 62:
+        keys = (src - low) + block * span
+        leftKeys, rightKeys = keys[~inRight], keys[inRight]
+        # cada bloco anterior tem exatamente `width` elementos em cada metade
+        lessRight = np.searchsorted(rightKeys, leftKeys, side='left') - leftBlock * width
+        lessEqualLeft = np.searchsorted(leftKeys, rightKeys, side='right') - rightBlock * width
+    else: # faixa de valores grande demais para a chave combinada: faz bloco a bloco
+        lessRight = np.empty(len(leftPos), dtype=np.int64)
+        lessEqualLeft = np.empty(len(rightPos), dtype=np.int64)
+        for b in range(int(block[-1]) + 1):
+            lo, mid, hi = b * 2 * width, min(b * 2 * width + width, n), min((b + 1) * 2 * width, n)
+            left, right = src[lo:mid], src[mid:hi]
+            lessRight[b * width:b * width + len(left)] = np.searchsorted(right, left, side='left')
+            lessEqualLeft[b * width:b * width + len(right)] = np.searchsorted(left, right, side='right')
+
+    # estável: empate vai para o elemento da esquerda
+    dst[leftPos + lessRight] = src[~inRight]
+    dst[rightPos - width + lessEqualLeft] = src[inRight]
+
+
+def merge_np(arr):
+    n = len(arr)
+    movements = 0
+    start = time.perf_counter_ns()
+
+    # merge de baixo para cima alternando entre arr e um único buffer auxiliar
+    src, dst = arr, np.empty_like(arr)
+    width = 1
+    while width < n:
+        mergePass(src, dst, width)
+        movements += n
+        src, dst = dst, src
+        width *= 2
+    if src is not arr:
+        arr[:] = src
+        movements += n
+
+    end = time.perf_counter_ns()
+
+    print("== MERGE SORT (NumPy) ==")
+    print(f"Tamanho do vetor: (n={n})")
+    print(f"Movimentos: {movements}")
+    print(f"Tempo: {(end - start) / 1e9:.6f}s")
+
+    # as comparações ficam dentro da searchsorted e não são contadas
+    return SortResult(None, movements, end - start)
+
+
+def heap_np(arr):
+    n = len(arr)
+    comparisons = 0
+    movements = 0
+    start = time.perf_counter_ns()
+
+    # monta a heap nível por nível, de baixo para cima: os nós de um mesmo nível têm subárvores disjuntas,
+    # então descem todos juntos sem conflito
+    lastParent = n // 2 - 1
+    level = max(lastParent + 1, 1).bit_length() - 1
+    while level >= 0 and lastParent >= 0:
+        nodes = np.arange(2 ** level - 1, min(2 ** (level + 1) - 1, lastParent + 1))
+        while len(nodes):
+            left = 2 * nodes + 1
+            right = left + 1
+            hasRight = right < n
+            child = left.copy()
+            better = hasRight & (arr[np.minimum(right, n - 1)] > arr[left])
+            child[better] = right[better]
+            comparisons += len(nodes) + int(np.count_nonzero(hasRight))
+            swap = arr[child] > arr[nodes]
+            nodes, child = nodes[swap], child[swap]
+            arr[nodes], arr[child] = arr[child], arr[nodes]
+            movements += 3 * len(nodes)
+            nodes = child[2 * child + 1 < n]
+        level -= 1
+
+    # a retirada do máximo é sequencial por natureza; numa lista Python sai mais rápido que com escalares NumPy
+    data = arr.tolist()
+    for last in range(n - 1, 0, -1):
+        data[last], data[0] = data[0], data[last]
+        movements += 3
+        i = 0
+        while True:
+            largest = i
+            left = 2 * i + 1
+            if left >= last:
+                break
+            comparisons += 1
+            if data[left] > data[largest]:
+                largest = left
+            if left + 1 < last:
+                comparisons += 1
+                if data[left + 1] > data[largest]:
+                    largest = left + 1
+            if largest == i:
+                break
+            data[i], data[largest] = data[largest], data[i]
+            movements += 3
+            i = largest
+    arr[:] = data
+
+    end = time.perf_counter_ns()
+
+    print("== HEAP SORT (NumPy) ==")
+    print(f"Tamanho do vetor: (n={n})")
+    print(f"Comparações: {comparisons}")
+    print(f"Movimentos: {movements}")
+    print(f"Tempo: {(end - start) / 1e9:.6f}s")
+
+    return SortResult(comparisons, movements, end - start)